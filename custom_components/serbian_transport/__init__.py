@@ -1,55 +1,203 @@
 """The Serbian Transport integration."""
+from functools import partial
 import logging
-import os
-import shutil
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
-from homeassistant.components.http import StaticPathConfig
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr, entity_registry as er
 from homeassistant.components.frontend import add_extra_js_url
 
-_LOGGER = logging.getLogger(__name__)
+from .cache import StationMetadataCache
+from .const import (
+    DOMAIN,
+    PLATFORMS,
+    CONF_GTFS,
+    CONF_IDLE_THROTTLE,
+    CONF_LINE_SENSORS,
+    CONF_LINES,
+    CONF_SEARCH_RADIUS,
+    CONF_STATIONS,
+    CONF_STATIONS_ATTRIBUTE,
+    CONF_STREAMING,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_IDLE_THROTTLE,
+    DEFAULT_LINE_SENSORS,
+    DEFAULT_SEARCH_RADIUS,
+    DEFAULT_STATIONS_ATTRIBUTE,
+    DEFAULT_STREAMING,
+    DEFAULT_UPDATE_INTERVAL,
+)
+from .frontend import CardAsset, CardView
+from .websocket import async_register_websocket_commands
 
-DOMAIN = "serbian_transport"
-PLATFORMS = ["sensor"]
+_LOGGER = logging.getLogger(__name__)
 
 async def async_setup(hass: HomeAssistant, config) -> bool:
     """Initialize through configuration.yaml."""
+    async_register_websocket_commands(hass)
+
+    # Serve the card from the integration directory under a URL carrying its
+    # content hash, so browsers cache it for good and pick up upgrades at once.
+    # Registered once per Home Assistant run: entry reloads do not touch it.
+    card = await hass.async_add_executor_job(CardAsset.load)
+    hass.http.register_view(CardView(card))
+    add_extra_js_url(hass, card.url)
+    # Compressing is the slow part; serve the plain card until it is done
+    hass.async_create_background_task(
+        _async_compress_card(hass, card), f"{DOMAIN} card compression"
+    )
+    return True
+
+async def _async_compress_card(hass: HomeAssistant, card: CardAsset) -> None:
+    """Compress the card in the executor; on failure it stays served uncompressed."""
+    try:
+        await hass.async_add_executor_job(card.compress)
+    except Exception:
+        _LOGGER.exception("Compressing the transport card failed, serving it uncompressed")
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate old config entries to one entry per location."""
+    if entry.version > 3:
+        return False
+
+    if entry.version < 3:
+        from .config_flow import location_unique_id
+
+        # Entity unique IDs and the device were global, scope them to the entry
+        @callback
+        def _migrate_unique_id(entity_entry: er.RegistryEntry):
+            if entity_entry.unique_id.startswith(f"{DOMAIN}_"):
+                return {
+                    "new_unique_id": entity_entry.unique_id.replace(
+                        DOMAIN, entry.entry_id, 1
+                    )
+                }
+            return None
+
+        await er.async_migrate_entries(hass, entry.entry_id, _migrate_unique_id)
+
+        device_registry = dr.async_get(hass)
+        device = device_registry.async_get_device(identifiers={(DOMAIN, "transport_stations")})
+        if device is not None:
+            device_registry.async_update_device(
+                device.id, new_identifiers={(DOMAIN, entry.entry_id)}
+            )
+
+        latitude = entry.data.get(CONF_LATITUDE, hass.config.latitude)
+        longitude = entry.data.get(CONF_LONGITUDE, hass.config.longitude)
+        hass.config_entries.async_update_entry(
+            entry, unique_id=location_unique_id(latitude, longitude), version=3
+        )
+        _LOGGER.debug("Migrated config entry %s to version 3", entry.entry_id)
+
     return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Serbian Transport from a config entry."""
-    hass.data.setdefault(DOMAIN, {})
-
-    # Create www/community directory if it doesn't exist
-    www_path = hass.config.path("www")
-    www_community = hass.config.path("www", "community")
-    www_component = hass.config.path("www", "community", DOMAIN)
-    
-    for path in [www_path, www_community, www_component]:
-        if not os.path.exists(path):
-            os.makedirs(path)
-    
-    # Copy component files from www directory
-    local_www = os.path.join(os.path.dirname(__file__), "www")
-    if os.path.exists(local_www):
-        for file in os.listdir(local_www):
-            src = os.path.join(local_www, file)
-            dst = os.path.join(www_component, file)
-            if os.path.isfile(src):
-                shutil.copy2(src, dst)
-                _LOGGER.debug("Copied %s to %s", src, dst)
-
-     # Register static path and Lovelace resource
-    url_path = f"/local/community/{DOMAIN}/transport-card.js"
-    file_path = hass.config.path(f"www/community/{DOMAIN}/transport-card.js")
-    
-    await hass.http.async_register_static_paths([
-        StaticPathConfig(url_path=url_path, path=file_path, cache_headers=True)
-    ])
-
-    # Register JS module
-    add_extra_js_url(hass, url_path)  
+    # Imported on first setup, keeping the API client out of the integration import
+    from .coordinator import TransportStationsCoordinator
+
+    latitude = entry.data.get(CONF_LATITUDE, hass.config.latitude)
+    longitude = entry.data.get(CONF_LONGITUDE, hass.config.longitude)
+    if latitude is None or longitude is None:
+        _LOGGER.error("Latitude and longitude must be configured")
+        return False
+    # Options set through the options flow take precedence over the initial data
+    rad = entry.options.get(CONF_SEARCH_RADIUS) or entry.data.get(
+        CONF_SEARCH_RADIUS, DEFAULT_SEARCH_RADIUS
+    )
+    _LOGGER.debug(
+        "Setting up coordinates (%.6f, %.6f) with radius %dm", latitude, longitude, rad
+    )
+
+    coordinator = TransportStationsCoordinator(
+        hass,
+        latitude,
+        longitude,
+        rad,
+        entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL),
+        name=entry.title,
+        cache=StationMetadataCache(hass, entry.entry_id),
+        stations=entry.options.get(CONF_STATIONS),
+        lines=entry.options.get(CONF_LINES),
+        streaming=entry.options.get(CONF_STREAMING, DEFAULT_STREAMING),
+        idle_throttle=entry.options.get(CONF_IDLE_THROTTLE, DEFAULT_IDLE_THROTTLE),
+    )
+    hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+
+    if await coordinator.async_load_cache():
+        # Stations are known already; fetch live vehicles without blocking setup
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
+    else:
+        try:
+            await coordinator.async_config_entry_first_refresh()
+        except Exception as e:
+            _LOGGER.error("Failed to fetch initial data: %s", e)
+            # Continue setup even if initial fetch fails - coordinator will retry
+    coordinator.async_start_stream()
+    if entry.options.get(CONF_GTFS):
+        # A first import can take a while: never hold up setup for it
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_set_timetable(entry.options[CONF_GTFS]),
+            f"{DOMAIN} timetable",
+        )
 
     # Load platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    return True
\ No newline at end of file
+    entry.async_on_unload(
+        entry.add_update_listener(
+            partial(async_options_updated, entity_options=_entity_options(entry))
+        )
+    )
+    return True
+
+async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Unload a config entry, stopping its polling and streams."""
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.async_shutdown()
+    return unload_ok
+
+def _entity_options(entry: ConfigEntry) -> tuple:
+    """Return the options that decide which entities exist and what they expose."""
+    return (
+        entry.options.get(CONF_LINE_SENSORS, DEFAULT_LINE_SENSORS),
+        entry.options.get(CONF_STATIONS_ATTRIBUTE, DEFAULT_STATIONS_ATTRIBUTE),
+    )
+
+async def async_options_updated(
+    hass: HomeAssistant, entry: ConfigEntry, entity_options: tuple
+) -> None:
+    """Apply changed options to the running coordinator."""
+    if _entity_options(entry) != entity_options:
+        # Entities have to be recreated; the cache keeps the reload warm
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is None:
+        return
+    coordinator.async_set_filters(
+        entry.options.get(CONF_STATIONS), entry.options.get(CONF_LINES)
+    )
+    coordinator.async_set_update_interval(
+        entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+    )
+    coordinator.async_set_idle_throttle(
+        entry.options.get(CONF_IDLE_THROTTLE, DEFAULT_IDLE_THROTTLE)
+    )
+    rad = entry.options.get(CONF_SEARCH_RADIUS, coordinator.rad)
+    await coordinator.async_set_radius(rad)
+    coordinator.async_set_streaming(entry.options.get(CONF_STREAMING, DEFAULT_STREAMING))
+    entry.async_create_background_task(
+        hass,
+        coordinator.async_set_timetable(entry.options.get(CONF_GTFS)),
+        f"{DOMAIN} timetable",
+    )
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the station cache of a removed location."""
+    await StationMetadataCache(hass, entry.entry_id).async_remove()
@@ -0,0 +1,198 @@
+"""HTTP client for the Serbian Transport API."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from aiohttp import ClientError, ClientResponseError, ClientSession, ClientTimeout, hdrs
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.singleton import singleton
+from homeassistant.util.json import json_loads
+
+from .const import (
+    DATA_CLIENT,
+    DEFAULT_API_BASE_URL,
+    DEFAULT_API_TIMEOUT,
+    DEFAULT_CONNECT_TIMEOUT,
+    DEFAULT_MAX_RETRIES,
+    VALIDATED_CACHE_SIZE,
+)
+from .models import Station, parse_stations
+from .resilience import RETRYABLE_STATUSES, CircuitBreaker, backoff_delay
+from .stats import ApiStats
+
+_LOGGER = logging.getLogger(__name__)
+
+REQUEST_TIMEOUT = ClientTimeout(total=DEFAULT_API_TIMEOUT, connect=DEFAULT_CONNECT_TIMEOUT)
+
+# aiohttp only decodes brotli when a brotli binding is installed
+try:
+    import brotli  # noqa: F401
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+    except ImportError:
+        ACCEPT_ENCODING = "gzip, deflate"
+    else:
+        ACCEPT_ENCODING = "gzip, br"
+else:
+    ACCEPT_ENCODING = "gzip, br"
+
+
+class _Validated:
+    """A parsed response with the validators to revalidate it."""
+
+    __slots__ = ("etag", "last_modified", "data")
+
+    def __init__(self, etag: Optional[str], last_modified: Optional[str], data: Any) -> None:
+        self.etag = etag
+        self.last_modified = last_modified
+        self.data = data
+
+
+class TransportApiError(Exception):
+    """Raised when the transport API cannot be queried."""
+
+
+class TransportApiClient:
+    """Thin client around a long-lived, pooled aiohttp session.
+
+    The session is Home Assistant's shared client session, so connections to
+    the API are kept alive between polls and DNS lookups are cached by the
+    shared connector instead of being repeated on every refresh.
+    """
+
+    def __init__(self, session: ClientSession, base_url: str = DEFAULT_API_BASE_URL) -> None:
+        """Initialize the client."""
+        self._session = session
+        self._base_url = base_url.rstrip("/")
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        # Per URL, keyed by query: circles move as locations come and go
+        self._validated: Dict[str, OrderedDict[Tuple[Tuple[str, Any], ...], _Validated]] = {}
+        self.stats = ApiStats()
+
+    @property
+    def session(self) -> ClientSession:
+        """Return the session requests are made with."""
+        return self._session
+
+    @property
+    def base_url(self) -> str:
+        """Return the API base URL, without a trailing slash."""
+        return self._base_url
+
+    def breaker(self, city: str) -> CircuitBreaker:
+        """Return the circuit breaker guarding one city backend."""
+        if city not in self._breakers:
+            self._breakers[city] = CircuitBreaker()
+        return self._breakers[city]
+
+    async def async_get_stations(
+        self, city: str, lat: float, lon: float, rad: int
+    ) -> List[Station]:
+        """Return the stations of one city backend around the given point."""
+        breaker = self.breaker(city)
+        if not breaker.allow_request():
+            raise TransportApiError(f"API for {city} is unavailable, not retrying yet")
+
+        url = f"{self._base_url}/api/stations/{city}/all"
+        params = {"lat": lat, "lon": lon, "rad": rad}
+        try:
+            data = await self._get_json(
+                url, params, lambda payload: parse_stations(payload, city)
+            )
+        except TransportApiError:
+            breaker.record_failure()
+            self.stats.failures += 1
+            raise
+        breaker.record_success()
+        return data
+
+    async def _get_json(
+        self, url: str, params: Dict[str, Any], parse: Callable[[Any], Any]
+    ) -> Any:
+        """GET a JSON document and ``parse`` it, retrying transient failures with backoff.
+
+        The body is decoded from bytes with Home Assistant's orjson-backed
+        json_loads. Responses carrying an ETag or Last-Modified header are
+        revalidated on the next request; on 304 Not Modified the previously
+        parsed result is returned as is, without downloading, decoding or
+        validating it again. Only the VALIDATED_CACHE_SIZE most recently used
+        queries of each URL are kept.
+        """
+        key = tuple(sorted(params.items()))
+        validated = self._validated.setdefault(url, OrderedDict())
+        headers = {hdrs.ACCEPT_ENCODING: ACCEPT_ENCODING}
+        if (cached := validated.get(key)) is not None:
+            validated.move_to_end(key)
+            if cached.etag:
+                headers[hdrs.IF_NONE_MATCH] = cached.etag
+            if cached.last_modified:
+                headers[hdrs.IF_MODIFIED_SINCE] = cached.last_modified
+
+        stats = self.stats
+        attempt = 0
+        while True:
+            stats.requests += 1
+            started = time.perf_counter()
+            try:
+                async with self._session.get(
+                    url, params=params, headers=headers, timeout=REQUEST_TIMEOUT
+                ) as resp:
+                    if resp.status == 304 and cached is not None:
+                        stats.latency_ms.record((time.perf_counter() - started) * 1000)
+                        stats.not_modified += 1
+                        _LOGGER.debug("%s not modified, reusing parsed response", url)
+                        return cached.data
+                    if resp.status in RETRYABLE_STATUSES:
+                        resp.raise_for_status()
+                    if resp.status != 200:
+                        raise TransportApiError(f"Error fetching data: {resp.status}")
+                    body = await resp.read()
+                    received = time.perf_counter()
+                    stats.latency_ms.record((received - started) * 1000)
+                    stats.bytes_received += len(body)
+                    stats.last_bytes = len(body)
+                    try:
+                        data = parse(json_loads(body))
+                    except (ValueError, TypeError) as err:
+                        raise TransportApiError(f"Invalid response: {err}") from err
+                    stats.decode_ms.record((time.perf_counter() - received) * 1000)
+                    etag = resp.headers.get(hdrs.ETAG)
+                    last_modified = resp.headers.get(hdrs.LAST_MODIFIED)
+                    if etag or last_modified:
+                        validated[key] = _Validated(etag, last_modified, data)
+                        validated.move_to_end(key)
+                        while len(validated) > VALIDATED_CACHE_SIZE:
+                            validated.popitem(last=False)
+                    else:
+                        validated.pop(key, None)
+                    return data
+            except (ClientError, asyncio.TimeoutError) as err:
+                reason = str(err) or "timeout"
+                retryable = (
+                    not isinstance(err, ClientResponseError)
+                    or err.status in RETRYABLE_STATUSES
+                )
+                if not retryable or attempt >= DEFAULT_MAX_RETRIES:
+                    raise TransportApiError(f"Exception while fetching: {reason}") from err
+                delay = backoff_delay(attempt)
+                attempt += 1
+                stats.retries += 1
+                _LOGGER.debug(
+                    "Request to %s failed (%s), retry %d/%d in %.1fs",
+                    url, reason, attempt, DEFAULT_MAX_RETRIES, delay,
+                )
+                await asyncio.sleep(delay)
+
+
+@callback
+@singleton(DATA_CLIENT)
+def async_get_client(hass: HomeAssistant) -> TransportApiClient:
+    """Return the transport client shared by every coordinator."""
+    return TransportApiClient(async_get_clientsession(hass))
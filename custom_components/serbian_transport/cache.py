@@ -0,0 +1,84 @@
+"""Persistent cache of station metadata, used to come up fast after a restart."""
+from __future__ import annotations
+
+from dataclasses import replace
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    STATION_CACHE_REFRESH,
+    STATION_CACHE_SAVE_DELAY,
+    STATION_CACHE_TTL,
+    STATION_CACHE_VERSION,
+)
+from .models import Station
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def station_metadata(station: Station) -> Station:
+    """Return a station without its real-time vehicles."""
+    return replace(station, vehicles=())
+
+
+class StationMetadataCache:
+    """Station names, coordinates and lines of one location, kept on disk."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the cache."""
+        self._store: Store[Dict[str, Any]] = Store(
+            hass, STATION_CACHE_VERSION, f"{DOMAIN}.{entry_id}.stations"
+        )
+        self._saved_at: float = 0
+        self._signature: Optional[int] = None
+
+    async def async_load(self) -> Optional[List[Station]]:
+        """Return the cached stations, or None if missing or expired."""
+        data = await self._store.async_load()
+        if not data:
+            return None
+        age = time.time() - data.get("saved_at", 0)
+        if age > STATION_CACHE_TTL:
+            _LOGGER.debug("Station cache expired %.0fs ago", age - STATION_CACHE_TTL)
+            return None
+        stations = [Station.from_dict(raw) for raw in data["stations"]]
+        self._saved_at = data["saved_at"]
+        self._signature = self._hash(stations)
+        return stations
+
+    @callback
+    def async_update(self, stations: List[Station]) -> None:
+        """Schedule a save if the station set changed or the cache is getting old."""
+        metadata = [station_metadata(station) for station in stations]
+        signature = self._hash(metadata)
+        if (
+            signature == self._signature
+            and time.time() - self._saved_at < STATION_CACHE_REFRESH
+        ):
+            return
+        self._signature = signature
+        self._saved_at = time.time()
+        saved_at = self._saved_at
+        self._store.async_delay_save(
+            lambda: {
+                "saved_at": saved_at,
+                "stations": [station.as_dict() for station in metadata],
+            },
+            STATION_CACHE_SAVE_DELAY,
+        )
+
+    async def async_remove(self) -> None:
+        """Delete the cache file."""
+        await self._store.async_remove()
+
+    @staticmethod
+    def _hash(metadata: List[Station]) -> int:
+        return hash(tuple(
+            (station.city, station.stop_id, station.name)
+            for station in metadata
+        ))
@@ -0,0 +1,167 @@
+"""Share upstream station fetches between locations with overlapping areas."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import replace
+import logging
+import time
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.singleton import singleton
+
+from .api import TransportApiClient, async_get_client
+from .const import COALESCE_MAX_AGE, DATA_COALESCER, MAX_COVER_RADIUS
+from .geo import haversine_m
+from .models import Station
+
+_LOGGER = logging.getLogger(__name__)
+
+Circle = Tuple[float, float, float]  # (lat, lon, radius in meters)
+
+
+class _CachedResult:
+    """Stations returned for one query circle."""
+
+    __slots__ = ("circle", "stations", "fetched_at")
+
+    def __init__(self, circle: Circle, stations: List[Station]) -> None:
+        self.circle = circle
+        self.stations = stations
+        self.fetched_at = time.monotonic()
+
+    @property
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def covers(self, circle: Circle) -> bool:
+        lat, lon, rad = self.circle
+        return haversine_m(lat, lon, circle[0], circle[1]) + circle[2] <= rad
+
+    def subset(self, circle: Circle) -> Optional[List[Station]]:
+        """Return the stations inside ``circle`` as if they were fetched now.
+
+        Distances are recomputed from the requested center and arrival times
+        are aged by the time since the fetch. Returns None if the payload has
+        no station coordinates to filter on.
+        """
+        age = int(self.age)
+        same_circle = circle == self.circle
+        result = []
+        for station in self.stations:
+            if not same_circle:
+                if station.lat is None or station.lon is None:
+                    return None
+                distance = haversine_m(circle[0], circle[1], station.lat, station.lon)
+                if distance > circle[2]:
+                    continue
+                station = replace(station, distance=distance)
+            result.append(station.aged(age))
+        return result
+
+
+class StationRequestCoalescer:
+    """Serve station requests of many locations with as few API calls as possible.
+
+    Every location registers its search circle. A request is answered from a
+    recent response whose circle covers it; otherwise the API is queried once
+    for a circle covering all registered locations that overlap the request,
+    and concurrent identical queries share the same in-flight call.
+    """
+
+    def __init__(self, client: TransportApiClient, max_age: float = COALESCE_MAX_AGE) -> None:
+        """Initialize the coalescer."""
+        self._client = client
+        self._max_age = max_age
+        self._circles: Dict[int, Circle] = {}
+        self._next_token = 0
+        self._cache: Dict[str, List[_CachedResult]] = {}
+        self._inflight: Dict[Tuple[str, Circle], asyncio.Future] = {}
+        # Cities whose payloads lack station coordinates: shared responses
+        # cannot be filtered for them, so each location queries its own circle
+        self._uncoordinated: Set[str] = set()
+
+    @callback
+    def register(self, lat: float, lon: float, rad: float) -> Callable[[], None]:
+        """Register a location's search circle; returns a callback removing it."""
+        token = self._next_token
+        self._next_token += 1
+        self._circles[token] = (lat, lon, rad)
+
+        @callback
+        def unregister() -> None:
+            self._circles.pop(token, None)
+
+        return unregister
+
+    async def async_get_stations(
+        self, city: str, lat: float, lon: float, rad: int
+    ) -> List[Station]:
+        """Return the stations of one city backend around the given point."""
+        circle = (lat, lon, rad)
+        results = self._cache.setdefault(city, [])
+        results[:] = [result for result in results if result.age < self._max_age]
+        for result in results:
+            if result.covers(circle) and (stations := result.subset(circle)) is not None:
+                _LOGGER.debug("Reusing %s stations fetched %.0fs ago", city, result.age)
+                return stations
+
+        if city in self._uncoordinated:
+            cover = circle
+        else:
+            cover = self._covering_circle(circle)
+        result = await self._async_query(city, cover)
+        stations = result.subset(circle)
+        if stations is None:
+            # No coordinates to filter a shared response on: query exactly
+            result = await self._async_query(city, circle)
+            stations = result.stations
+        return stations
+
+    async def _async_query(self, city: str, circle: Circle) -> _CachedResult:
+        """Query the API once per city and circle, sharing in-flight calls."""
+        key = (city, circle)
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(self._async_fetch(city, circle))
+            self._inflight[key] = future
+            future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # Shielded so one caller timing out does not cancel the others
+        return await asyncio.shield(future)
+
+    async def _async_fetch(self, city: str, circle: Circle) -> _CachedResult:
+        stations = await self._client.async_get_stations(city, *circle)
+        if any(station.lat is None or station.lon is None for station in stations):
+            self._uncoordinated.add(city)
+        elif stations:
+            self._uncoordinated.discard(city)
+        result = _CachedResult(circle, stations)
+        self._cache.setdefault(city, []).append(result)
+        return result
+
+    def _covering_circle(self, circle: Circle) -> Circle:
+        """Return a circle covering ``circle`` and the registered circles overlapping it."""
+        lat, lon, rad = circle
+        group = [
+            other for other in self._circles.values()
+            if haversine_m(lat, lon, other[0], other[1]) < rad + other[2]
+        ]
+        if len(group) < 2:
+            return circle
+
+        center_lat = sum(other[0] for other in group) / len(group)
+        center_lon = sum(other[1] for other in group) / len(group)
+        cover_rad = max(
+            haversine_m(center_lat, center_lon, other[0], other[1]) + other[2]
+            for other in (*group, circle)
+        )
+        if cover_rad > MAX_COVER_RADIUS:
+            return circle
+        return (round(center_lat, 6), round(center_lon, 6), int(cover_rad) + 1)
+
+
+@callback
+@singleton(DATA_COALESCER)
+def async_get_coalescer(hass: HomeAssistant) -> StationRequestCoalescer:
+    """Return the request coalescer shared by every location."""
+    return StationRequestCoalescer(async_get_client(hass))
@@ -2,28 +2,49 @@
 from __future__ import annotations
 
 import logging
+import os
 import voluptuous as vol
 from typing import Any
 
 # Import these at module level
 from homeassistant.config_entries import ConfigFlow, ConfigEntry, OptionsFlow
-from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, CONF_NAME
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
 import homeassistant.helpers.config_validation as cv
 
 from .const import (
     DOMAIN, 
+    CONF_GTFS,
+    CONF_IDLE_THROTTLE,
+    CONF_LINE_SENSORS,
+    CONF_LINES,
     CONF_SEARCH_RADIUS, 
-    DEFAULT_SEARCH_RADIUS
+    CONF_STATIONS,
+    CONF_STATIONS_ATTRIBUTE,
+    CONF_STREAMING,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_IDLE_THROTTLE,
+    DEFAULT_LINE_SENSORS,
+    DEFAULT_NAME,
+    DEFAULT_SEARCH_RADIUS,
+    DEFAULT_STATIONS_ATTRIBUTE,
+    DEFAULT_STREAMING,
+    DEFAULT_UPDATE_INTERVAL,
 )
 
+
+def location_unique_id(latitude: float, longitude: float) -> str:
+    """Return the unique ID of a location, one config entry per point."""
+    return f"{latitude:.5f}_{longitude:.5f}"
+
+
 _LOGGER = logging.getLogger(__name__)
 
 class SerbianTransportConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Serbian Transport."""
 
-    VERSION = 2  # Increment version for migration
+    VERSION = 3  # Increment version for migration
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
@@ -31,10 +52,6 @@ class SerbianTransportConfigFlow(ConfigFlow, domain=DOMAIN):
         """Handle the initial step."""
         errors = {}
 
-        # Проверка на дубликаты
-        await self.async_set_unique_id(DOMAIN)
-        self._abort_if_unique_id_configured()
-
         if user_input is not None:
             search_rad = user_input.get(CONF_SEARCH_RADIUS, DEFAULT_SEARCH_RADIUS)
             
@@ -47,8 +64,12 @@ class SerbianTransportConfigFlow(ConfigFlow, domain=DOMAIN):
                 longitude = None
 
             if latitude is not None and longitude is not None:
+                # Проверка на дубликаты: одна запись на точку
+                await self.async_set_unique_id(location_unique_id(latitude, longitude))
+                self._abort_if_unique_id_configured()
+
                 return self.async_create_entry(
-                    title="Serbian Transport",
+                    title=user_input.get(CONF_NAME, DEFAULT_NAME),
                     data={
                         CONF_LATITUDE: latitude,
                         CONF_LONGITUDE: longitude,
@@ -60,6 +81,10 @@ class SerbianTransportConfigFlow(ConfigFlow, domain=DOMAIN):
             step_id="user",
             data_schema=vol.Schema(
                 {
+                    vol.Required(
+                        CONF_NAME,
+                        default=DEFAULT_NAME
+                    ): cv.string,
                     vol.Required(
                         CONF_LATITUDE,
                         default=self.hass.config.latitude if self.hass.config.latitude else 0.0
@@ -96,8 +121,29 @@ class SerbianTransportOptionsFlow(OptionsFlow):
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Manage the options."""
+        errors = {}
         if user_input is not None:
-            return self.async_create_entry(title="", data=user_input)
+            feed_path = user_input.get(CONF_GTFS, "").strip()
+            if feed_path and not await self.hass.async_add_executor_job(os.path.isfile, feed_path):
+                errors[CONF_GTFS] = "gtfs_not_found"
+            else:
+                return self.async_create_entry(
+                    title="", data={**user_input, CONF_GTFS: feed_path}
+                )
+
+        # Offer the stations and lines the running coordinator currently sees,
+        # plus whatever is selected already
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.config_entry.entry_id)
+        selected_stations = self.config_entry.options.get(CONF_STATIONS, [])
+        selected_lines = self.config_entry.options.get(CONF_LINES, [])
+        station_options = {key: key for key in selected_stations}
+        line_options = {line: line for line in selected_lines}
+        if coordinator is not None:
+            station_options.update({
+                station.key: f"{station.name} (#{station.stop_id})"
+                for station in coordinator.in_radius
+            })
+            line_options.update({line: line for line in coordinator.available_lines()})
 
         return self.async_show_form(
             step_id="init",
@@ -105,11 +151,58 @@ class SerbianTransportOptionsFlow(OptionsFlow):
                 {
                     vol.Required(
                         CONF_SEARCH_RADIUS,
-                        default=self.config_entry.options.get(CONF_SEARCH_RADIUS, DEFAULT_SEARCH_RADIUS)
+                        default=self.config_entry.options.get(
+                            CONF_SEARCH_RADIUS,
+                            self.config_entry.data.get(CONF_SEARCH_RADIUS, DEFAULT_SEARCH_RADIUS),
+                        )
                     ): vol.All(
                         vol.Coerce(int),
                         vol.Range(min=100, max=20000)
                     ),
+                    vol.Required(
+                        CONF_UPDATE_INTERVAL,
+                        default=self.config_entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=10, max=300)
+                    ),
+                    vol.Optional(
+                        CONF_STATIONS,
+                        default=selected_stations
+                    ): cv.multi_select(station_options),
+                    vol.Optional(
+                        CONF_LINES,
+                        default=selected_lines
+                    ): cv.multi_select(line_options),
+                    vol.Required(
+                        CONF_LINE_SENSORS,
+                        default=self.config_entry.options.get(
+                            CONF_LINE_SENSORS, DEFAULT_LINE_SENSORS
+                        )
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_STATIONS_ATTRIBUTE,
+                        default=self.config_entry.options.get(
+                            CONF_STATIONS_ATTRIBUTE, DEFAULT_STATIONS_ATTRIBUTE
+                        )
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_STREAMING,
+                        default=self.config_entry.options.get(
+                            CONF_STREAMING, DEFAULT_STREAMING
+                        )
+                    ): cv.boolean,
+                    vol.Required(
+                        CONF_IDLE_THROTTLE,
+                        default=self.config_entry.options.get(
+                            CONF_IDLE_THROTTLE, DEFAULT_IDLE_THROTTLE
+                        )
+                    ): cv.boolean,
+                    vol.Optional(
+                        CONF_GTFS,
+                        default=self.config_entry.options.get(CONF_GTFS, "")
+                    ): cv.string,
                 }
-            )
+            ),
+            errors=errors,
         )
\ No newline at end of file
@@ -1,20 +1,76 @@
 """Constants for the Serbian Transport integration."""
-from typing import Final, Dict
+from typing import Final, Dict, Tuple
 
 DOMAIN: Final = "serbian_transport"
 PLATFORMS: Final[list[str]] = ["sensor"]
 
+# hass.data keys
+DATA_CLIENT: Final = f"{DOMAIN}_client"
+DATA_COALESCER: Final = f"{DOMAIN}_coalescer"
+DATA_TIMETABLES: Final = f"{DOMAIN}_timetables"
+
 # API Configuration
 DEFAULT_API_BASE_URL: Final = "https://transport-api.dzarlax.dev"
-DEFAULT_API_TIMEOUT: Final = 10  # seconds
+DEFAULT_API_TIMEOUT: Final = 10  # seconds, per attempt
+DEFAULT_CONNECT_TIMEOUT: Final = 5  # seconds
 DEFAULT_MAX_RETRIES: Final = 3
+DEFAULT_BACKOFF_BASE: Final = 0.5  # seconds
+DEFAULT_BACKOFF_MAX: Final = 4  # seconds
+DEFAULT_BREAKER_THRESHOLD: Final = 3  # consecutive failures
+DEFAULT_BREAKER_RECOVERY: Final = 60  # seconds
 DEFAULT_UPDATE_INTERVAL: Final = 30  # seconds
+FAST_UPDATE_INTERVAL: Final = 10  # seconds, while a departure is imminent and watched
+MAX_UPDATE_INTERVAL: Final = 300  # seconds, no service or API failing
+FAST_POLL_THRESHOLD: Final = 300  # seconds to the next departure that count as imminent
+IDLE_TIMEOUT: Final = 900  # seconds without an open card or station read before polling slows down
+# Worst case of one city request: every attempt timing out, plus the longest
+# backoff between them and a second of slack, so retries are never cut short
+DEFAULT_CITY_TIMEOUT: Final = (
+    (DEFAULT_MAX_RETRIES + 1) * DEFAULT_API_TIMEOUT
+    + sum(
+        min(DEFAULT_BACKOFF_MAX, DEFAULT_BACKOFF_BASE * 2**attempt)
+        for attempt in range(DEFAULT_MAX_RETRIES)
+    )
+    + 1
+)  # seconds
+STALE_DATA_MAX_AGE: Final = 600  # seconds to keep serving last good data
+COALESCE_MAX_AGE: Final = 20  # seconds a response may be shared with other locations
+VALIDATED_CACHE_SIZE: Final = 4  # responses kept for revalidation per endpoint, least recent dropped
+MAX_COVER_RADIUS: Final = 20000  # meters, largest circle queried on behalf of several locations
+
+# Streaming (Server-Sent Events)
+STREAM_PATH: Final = "/api/stations/{city}/stream"
+STREAM_READ_TIMEOUT: Final = 60  # seconds without data, keepalives included, before reconnecting
+STREAM_RECONNECT_MIN: Final = 5  # seconds
+STREAM_RECONNECT_MAX: Final = 300  # seconds
+
+# Offline timetable (GTFS)
+SCHEDULE_HORIZON: Final = 2 * 3600  # seconds of scheduled departures served per refresh
+
+# Station metadata cache
+STATION_CACHE_VERSION: Final = 1
+STATION_CACHE_TTL: Final = 7 * 24 * 3600  # seconds before cached stations are ignored
+STATION_CACHE_REFRESH: Final = 24 * 3600  # seconds before an unchanged cache is rewritten
+STATION_CACHE_SAVE_DELAY: Final = 30  # seconds, batches writes
 
 # Configuration constants
+DEFAULT_NAME = "Serbian Transport"
 CONF_STATION_ID = "station_id"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_SEARCH_RADIUS = "search_rad"
 DEFAULT_SEARCH_RADIUS = 1000  # meters
+CONF_STATIONS = "stations"  # allow-list of station keys, empty for all
+CONF_LINES = "lines"  # allow-list of line numbers, empty for all
+CONF_LINE_SENSORS = "line_sensors"  # create a next departure sensor per line
+DEFAULT_LINE_SENSORS = False
+CONF_STATIONS_ATTRIBUTE = "stations_attribute"  # expose the full payload as an attribute
+DEFAULT_STATIONS_ATTRIBUTE = False
+CONF_GTFS = "gtfs"  # path to a GTFS static feed served while the API is down
+CONF_STREAMING = "streaming"  # receive vehicle updates over an event stream
+DEFAULT_STREAMING = False
+CONF_IDLE_THROTTLE = "idle_throttle"  # poll rarely while no card is open
+DEFAULT_IDLE_THROTTLE = False
+DEPARTURES_TOP_N: Final = 10  # departures kept in the next departure attributes
 
 # Service constants
 ATTR_NEXT_DEPARTURE = "next_departure"
@@ -28,6 +84,13 @@ API_ENDPOINTS: Final[Dict[str, str]] = {
     "unified": DEFAULT_API_BASE_URL  # Single endpoint that handles all cities
 }
 
+# City backends and the area they cover: (min_lat, min_lon, max_lat, max_lon)
+CITY_BOUNDS: Final[Dict[str, Tuple[float, float, float, float]]] = {
+    "bg": (44.55, 20.10, 45.00, 20.75),   # Belgrade
+    "ns": (45.15, 19.65, 45.40, 20.05),   # Novi Sad
+    "nis": (43.20, 21.75, 43.45, 22.10),  # Niš
+}
+
 # Sensor types
 SENSOR_TYPES: Final[Dict[str, Dict[str, str]]] = {
     "stations_count": {
@@ -1,42 +1,185 @@
+from __future__ import annotations
+
 import asyncio
+from dataclasses import replace
+from hashlib import sha1
 import logging
-import aiohttp
+import sqlite3
+import time
 from datetime import timedelta
+from typing import TYPE_CHECKING
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import STORAGE_DIR
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import TransportApiError, async_get_client
+from .cache import StationMetadataCache, station_metadata
+from .coalescer import StationRequestCoalescer, async_get_coalescer
+from .const import (
+    CITY_BOUNDS,
+    DATA_TIMETABLES,
+    DEFAULT_CITY_TIMEOUT,
+    DOMAIN,
+    DEFAULT_UPDATE_INTERVAL,
+    FAST_POLL_THRESHOLD,
+    FAST_UPDATE_INTERVAL,
+    IDLE_TIMEOUT,
+    MAX_UPDATE_INTERVAL,
+    SCHEDULE_HORIZON,
+    STALE_DATA_MAX_AGE,
+)
+from .departures import DepartureIndex
+from .geo import StationIndex, circle_intersects_bbox
+from .stats import CoordinatorStats
+
+if TYPE_CHECKING:
+    from .gtfs import GtfsTimetable
 
 _LOGGER = logging.getLogger(__name__)
 
-SERVER_IP = "https://transport-api.dzarlax.dev"
 
-async def fetch_stations(session, lat, lon, rad):
-    """Запрос к вашему API, возвращает список остановок."""
-    # Пример — нужно адаптировать под ваш реальный endpoint
-    # Можно ходить по нескольким городам (как у вас BG, NS, NIS) в цикле
-    url = f"{SERVER_IP}/api/stations/bg/all"
-    params = {"lat": lat, "lon": lon, "rad": rad}
+def station_signature(stations):
+    """Return a hash of the station set, with arrivals rounded to whole minutes."""
+    return hash(tuple(
+        (
+            station.key,
+            station.name,
+            tuple((vehicle.line, vehicle.seconds_left // 60) for vehicle in station.vehicles),
+        )
+        for station in stations or ()
+    ))
+
+
+def cities_in_range(lat, lon, rad):
+    """Return the city backends whose area intersects the search circle."""
+    return [
+        city for city, bbox in CITY_BOUNDS.items()
+        if circle_intersects_bbox(lat, lon, rad, bbox)
+    ]
+
+
+async def _fetch_city(client: StationRequestCoalescer, city, lat, lon, rad):
+    """Fetch one city backend, bounded by the per-city timeout."""
+    async with asyncio.timeout(DEFAULT_CITY_TIMEOUT):
+        return await client.async_get_stations(city, lat, lon, rad)
+
+
+async def fetch_stations(client: StationRequestCoalescer, lat, lon, rad):
+    """Запрос ко всем городам в радиусе параллельно.
+
+    Возвращает список остановок и города, запрос к которым не удался.
+    """
+    cities = cities_in_range(lat, lon, rad)
+    if not cities:
+        _LOGGER.debug("No city backend covers (%s, %s) within %sm", lat, lon, rad)
+        return [], frozenset()
+
+    results = await asyncio.gather(
+        *(_fetch_city(client, city, lat, lon, rad) for city in cities),
+        return_exceptions=True,
+    )
+
+    stations = []
+    errors = {}
+    for city, result in zip(cities, results):
+        if isinstance(result, (TransportApiError, TimeoutError)):
+            reason = str(result) or "timeout"
+            _LOGGER.warning("Failed to fetch stations for %s: %s", city, reason)
+            errors[city] = reason
+        elif isinstance(result, BaseException):
+            raise result
+        else:
+            stations.extend(result)
+
+    if len(errors) == len(cities):
+        reasons = "; ".join(f"{city}: {reason}" for city, reason in errors.items())
+        raise UpdateFailed(f"Error fetching data: {reasons}")
+    return stations, frozenset(errors)
+
+
+async def async_get_timetable(hass: HomeAssistant, feed_path: str) -> GtfsTimetable | None:
+    """Return the timetable of a GTFS feed, imported once for every location."""
+    from .gtfs import GtfsError, GtfsTimetable
+
+    imports = hass.data.setdefault(DATA_TIMETABLES, {})
+    if feed_path not in imports:
+        digest = sha1(feed_path.encode()).hexdigest()[:12]
+        db_path = hass.config.path(STORAGE_DIR, f"{DOMAIN}.gtfs.{digest}.sqlite")
+        imports[feed_path] = hass.async_add_executor_job(GtfsTimetable.open, feed_path, db_path)
     try:
-        async with session.get(url, params=params) as resp:
-            if resp.status != 200:
-                raise UpdateFailed(f"Error fetching data: {resp.status}")
-            data = await resp.json()
-            return data
-    except Exception as e:
-        raise UpdateFailed(f"Exception while fetching: {e}")
+        return await imports[feed_path]
+    except GtfsError as err:
+        imports.pop(feed_path, None)
+        _LOGGER.error("Offline timetable unavailable: %s", err)
+        return None
+    except Exception:
+        # Never leave a failed import cached: the next call retries it
+        imports.pop(feed_path, None)
+        _LOGGER.exception("Unexpected error importing GTFS feed %s", feed_path)
+        return None
+
+
+def _api_distance(station):
+    return station.distance if station.distance is not None else float("inf")
+
 
 class TransportStationsCoordinator(DataUpdateCoordinator):
     """Координатор для получения и кэширования данных об остановках."""
 
-    def __init__(self, hass, lat, lon, rad):
+    def __init__(
+        self,
+        hass,
+        lat,
+        lon,
+        rad,
+        update_interval=DEFAULT_UPDATE_INTERVAL,
+        name="transport_stations",
+        cache: StationMetadataCache | None = None,
+        stations=None,
+        lines=None,
+        streaming=False,
+        idle_throttle=False,
+    ):
         """Инициализация."""
         super().__init__(
             hass,
             _LOGGER,
-            name="transport_stations_coordinator",
-            update_interval=timedelta(seconds=30),  # Частота обновления
+            name=f"{name}_coordinator",
+            update_interval=timedelta(seconds=update_interval),  # Базовая частота обновления
         )
         self.lat = lat
         self.lon = lon
         self.rad = rad
+        self.base_interval = update_interval
+        self.frontend_subscribers = 0
+        self.idle_throttle = idle_throttle  # slow down while no card reads the data
+        self._consumed_at = time.monotonic()  # last time a card or websocket client read the data
+        self._failures = 0
+        self.cache = cache
+        self.client = async_get_coalescer(hass)
+        self._unregister_circle = self.client.register(lat, lon, rad)
+        self.stale = False
+        self.departures = DepartureIndex()
+        self.station_signature = None
+        self._notified_signature = None
+        self._stats_listeners = []  # notified on every update, even unchanged ones
+        self.station_filter = frozenset(stations or ())
+        self.line_filter = frozenset(lines or ())
+        self.stations_by_key = {}
+        self.in_radius = []  # stations in the search circle before the allow-lists
+        self.fetch_rad = 0  # radius the current payload is complete for, 0 if partial
+        self._stations = []  # payload before radius filtering
+        self._spatial = StationIndex([])
+        self._last_good_data = None
+        self.fetched_at = None  # monotonic time the published arrival times were taken
+        self._last_good_at = None  # monotonic time of the last successful fetch
+        self.realtime = True  # False while departures come from the timetable
+        self.timetable = None
+        self.scheduled_lines = []  # lines the timetable runs through the search circle
+        self.stats = CoordinatorStats()
+        self.streaming = streaming
+        self._streams = []
 
     @property
     def station_count(self) -> int:
@@ -53,12 +196,379 @@ class TransportStationsCoordinator(DataUpdateCoordinator):
     async def _async_update_data(self):
         """Функция, которую вызывает HA для обновления данных."""
         _LOGGER.debug(f"Fetching transport data for coordinates ({self.lat}, {self.lon}) with radius {self.rad}m")
+        rad = self.rad
+        started = time.perf_counter()
         try:
-            # Здесь пишем логику обращения к API
-            async with aiohttp.ClientSession() as session:
-                stations = await fetch_stations(session, self.lat, self.lon, self.rad)
-                _LOGGER.debug(f"Successfully fetched {len(stations) if stations else 0} stations")
-                return stations
-        except Exception as e:
+            stations, failed = await fetch_stations(self.client, self.lat, self.lon, rad)
+        except UpdateFailed as e:
+            self.stats.failed_refreshes += 1
+            self._failures += 1
+            self.update_interval = timedelta(seconds=self._next_interval())
+            if self._can_serve_stale():
+                _LOGGER.warning("Error fetching transport data, serving last known data: %s", e)
+                self.stale = True
+                self.stats.stale_serves += 1
+                return self._publish(self._last_good_data)
+            if self.timetable is not None:
+                try:
+                    stations = await self.hass.async_add_executor_job(
+                        self.timetable.stations,
+                        self._stations,
+                        self.lat,
+                        self.lon,
+                        self.rad,
+                        dt_util.now(),
+                        SCHEDULE_HORIZON,
+                    )
+                except sqlite3.Error as err:
+                    _LOGGER.error("Timetable lookup failed: %s", err)
+                else:
+                    _LOGGER.warning("Error fetching transport data, serving the timetable: %s", e)
+                    self.stale = False
+                    self.realtime = False
+                    self.fetched_at = time.monotonic()
+                    self.stats.timetable_serves += 1
+                    return self._publish(stations)
             _LOGGER.error(f"Error fetching transport data: {e}")
-            raise
\ No newline at end of file
+            raise
+
+        self.stats.refreshes += 1
+        self.stats.refresh_ms.record((time.perf_counter() - started) * 1000)
+        _LOGGER.debug(f"Successfully fetched {len(stations) if stations else 0} stations")
+        return self._accept(stations, rad, failed)
+
+    def _accept(self, stations, rad, failed=frozenset()):
+        """Publish freshly received stations, fetched or streamed.
+
+        ``failed`` names the cities whose fetch failed. Their last known
+        stations are kept without vehicles, and the partial result is neither
+        saved to the cache nor filtered locally on a radius change.
+        """
+        if failed:
+            stations = stations + [
+                station_metadata(station) for station in self._stations if station.city in failed
+            ]
+        self.stale = False
+        self.realtime = True
+        self._failures = 0
+        self.fetch_rad = 0 if failed else rad
+        self._last_good_data = stations
+        self.fetched_at = self._last_good_at = time.monotonic()
+        data = self._publish(stations)
+        if self.cache is not None and not failed:
+            self.cache.async_update(stations)
+        self.update_interval = timedelta(seconds=self._next_interval())
+        return data
+
+    def _next_interval(self) -> float:
+        """Pick the delay before the next poll.
+
+        Failing API: exponential backoff from the base interval. Stream
+        connected or no departures at all (e.g. overnight): poll rarely.
+        Imminent departure: poll fast, unless idle throttling is on and no
+        card is open. Idle with no departure imminent: poll rarely. Otherwise
+        poll at a quarter of the time to the next departure, never more often
+        than the configured interval.
+        """
+        if self._failures:
+            return min(MAX_UPDATE_INTERVAL, self.base_interval * 2 ** self._failures)
+
+        departure = self.departures.next
+        if departure is None or self.stream_connected:
+            return MAX_UPDATE_INTERVAL
+        if departure.seconds <= FAST_POLL_THRESHOLD:
+            if self.frontend_subscribers or not self.idle_throttle:
+                return min(FAST_UPDATE_INTERVAL, self.base_interval)
+        elif self.idle:
+            return MAX_UPDATE_INTERVAL
+        return min(MAX_UPDATE_INTERVAL, max(self.base_interval, departure.seconds / 4))
+
+    @property
+    def idle(self) -> bool:
+        """Return True if idle throttling is on and no card has read the data for a while.
+
+        Sensor state reads by automations or stock cards are not visible
+        here, which is why throttling is opt-in.
+        """
+        return (
+            self.idle_throttle
+            and not self.frontend_subscribers
+            and time.monotonic() - self._consumed_at > IDLE_TIMEOUT
+        )
+
+    @callback
+    def async_mark_consumed(self) -> None:
+        """Record a read of the data, waking polling up if it was idle."""
+        was_idle = self.idle
+        self._consumed_at = time.monotonic()
+        if was_idle:
+            self.update_interval = timedelta(seconds=self._next_interval())
+            self.hass.async_create_task(self.async_request_refresh())
+
+    @callback
+    def async_add_frontend_subscriber(self):
+        """Track a live card subscription; returns a callback removing it."""
+        self.async_mark_consumed()
+        self.frontend_subscribers += 1
+
+        @callback
+        def remove_subscriber() -> None:
+            self.frontend_subscribers -= 1
+            # The idle timeout runs from when the last card closed
+            self._consumed_at = time.monotonic()
+
+        return remove_subscriber
+
+    def _publish(self, stations):
+        """Index a payload and return the stations inside the search circle, nearest first.
+
+        Also derives the departure index and change signatures from the result.
+        """
+        self._stations = stations
+        self._spatial = StationIndex(stations)
+        self.in_radius = self._filter_radius(stations)
+        data = self._filter_allowed(self.in_radius)
+        self.stations_by_key = {station.key: station for station in data}
+        self.departures = DepartureIndex.build(data)
+        self.station_signature = station_signature(data)
+        self.stats.stations = len(data)
+        self.stats.vehicles = self.departures.count
+        return data
+
+    def _filter_radius(self, stations):
+        """Return the stations within the search radius, nearest first."""
+        if not self._spatial.complete:
+            # No coordinates to measure: trust the API's radius and distances
+            return sorted(stations, key=_api_distance)
+        return [
+            replace(station, distance=round(distance, 1))
+            for distance, station in self._spatial.within(self.lat, self.lon, self.rad)
+        ]
+
+    def _filter_allowed(self, stations):
+        """Apply the station and line allow-lists of the entry."""
+        if self.station_filter:
+            stations = [
+                station for station in stations if station.key in self.station_filter
+            ]
+        if self.line_filter:
+            stations = [
+                replace(
+                    station,
+                    vehicles=tuple(
+                        vehicle for vehicle in station.vehicles
+                        if vehicle.line in self.line_filter
+                    ),
+                )
+                for station in stations
+            ]
+        return stations
+
+    def available_lines(self):
+        """Return the line numbers seen in, or scheduled through, the search circle."""
+        return sorted(
+            {vehicle.line for station in self.in_radius for vehicle in station.vehicles}
+            | set(self.scheduled_lines),
+            key=lambda line: (len(line), line),
+        )
+
+    @callback
+    def async_set_filters(self, stations, lines) -> None:
+        """Change the allow-lists and republish the current payload."""
+        station_filter = frozenset(stations or ())
+        line_filter = frozenset(lines or ())
+        if (station_filter, line_filter) == (self.station_filter, self.line_filter):
+            return
+        self.station_filter = station_filter
+        self.line_filter = line_filter
+        if self.data is not None:
+            self.async_set_updated_data(self._publish(self._stations))
+
+    def nearest(self, count):
+        """Return the ``count`` stations nearest to the location."""
+        if self.station_filter or not self._spatial.complete:
+            # Published data is already nearest first
+            return (self.data or [])[:count]
+        return self._filter_allowed([
+            replace(station, distance=round(distance, 1))
+            for distance, station in self._spatial.nearest(self.lat, self.lon, count)
+            if distance <= self.rad
+        ])
+
+    @callback
+    def async_set_update_interval(self, update_interval) -> None:
+        """Change the base polling interval, effective from the next refresh."""
+        if update_interval == self.base_interval:
+            return
+        self.base_interval = update_interval
+        self.update_interval = timedelta(seconds=self._next_interval())
+        if self.last_update_success:
+            # Reschedule the pending refresh instead of waiting out the old interval
+            self._schedule_refresh()
+
+    @callback
+    def async_set_idle_throttle(self, idle_throttle) -> None:
+        """Turn idle throttling on or off, effective from the next refresh."""
+        if idle_throttle == self.idle_throttle:
+            return
+        was_idle = self.idle
+        self.idle_throttle = idle_throttle
+        self.update_interval = timedelta(seconds=self._next_interval())
+        if was_idle and self.last_update_success:
+            self._schedule_refresh()
+
+    async def async_set_radius(self, rad) -> None:
+        """Change the search radius, filtering locally when the data allows it."""
+        if rad == self.rad:
+            return
+        self.rad = rad
+        self._unregister_circle()
+        self._unregister_circle = self.client.register(self.lat, self.lon, rad)
+        if self._streams:
+            self.async_stop_stream()
+            self.async_start_stream()
+        if rad <= self.fetch_rad and self._spatial.complete:
+            _LOGGER.debug("Radius reduced to %sm, filtering cached stations", rad)
+            self.async_set_updated_data(self._publish(self._stations))
+        else:
+            await self.async_request_refresh()
+
+    async def async_load_cache(self) -> bool:
+        """Publish cached station metadata before the first fetch.
+
+        Returns True if cached stations were found; entities can then come up
+        immediately and the first real-time fetch can run in the background.
+        """
+        if self.cache is None:
+            return False
+        stations = await self.cache.async_load()
+        if stations is None:
+            return False
+        _LOGGER.debug("Loaded %d stations from cache", len(stations))
+        self.async_set_updated_data(self._publish(stations))
+        return True
+
+    async def async_set_timetable(self, feed_path) -> None:
+        """Load the GTFS feed served when the live API fails, importing it if needed."""
+        timetable = await async_get_timetable(self.hass, feed_path) if feed_path else None
+        self.timetable = timetable
+        self.scheduled_lines = []
+        if timetable is not None:
+            self.scheduled_lines = await self.hass.async_add_executor_job(
+                timetable.lines_near, self.lat, self.lon, self.rad
+            )
+
+    @property
+    def stream_connected(self) -> bool:
+        """Return True while every city in range is streaming updates."""
+        return bool(self._streams) and all(stream.connected for stream in self._streams)
+
+    @callback
+    def async_start_stream(self) -> None:
+        """Subscribe to pushed updates, if enabled; polling continues as a safety net."""
+        if not self.streaming or self._streams:
+            return
+        from .stream import StationStream
+
+        # Same session and backend as the polls
+        client = async_get_client(self.hass)
+        circle = (self.lat, self.lon, self.rad)
+        self._streams = [
+            StationStream(
+                client.session,
+                city,
+                circle,
+                self._async_stream_updated,
+                self._async_stream_dropped,
+                client.base_url,
+            )
+            for city in cities_in_range(self.lat, self.lon, self.rad)
+        ]
+        for stream in self._streams:
+            stream.async_start(self.hass)
+
+    @callback
+    def async_stop_stream(self) -> None:
+        """Close the streams and go back to polling."""
+        for stream in self._streams:
+            stream.async_stop()
+        self._streams = []
+        self.update_interval = timedelta(seconds=self._next_interval())
+
+    @callback
+    def async_set_streaming(self, streaming) -> None:
+        """Turn streaming on or off."""
+        self.streaming = streaming
+        if streaming:
+            self.async_start_stream()
+        else:
+            self.async_stop_stream()
+
+    @callback
+    def _async_stream_updated(self) -> None:
+        """Publish the merged state once every city in range is streaming."""
+        if not self.stream_connected:
+            return
+        self.stats.stream_updates += 1
+        stations = [station for stream in self._streams for station in stream.current()]
+        self.async_set_updated_data(self._accept(stations, self.rad))
+
+    @callback
+    def _async_stream_dropped(self) -> None:
+        """Fall back to polling until the stream is back."""
+        _LOGGER.debug("Station stream dropped, falling back to polling")
+        self.update_interval = timedelta(seconds=self._next_interval())
+        self.hass.async_create_task(self.async_request_refresh())
+
+    async def async_shutdown(self) -> None:
+        """Stop sharing fetches for this location."""
+        self.async_stop_stream()
+        self._unregister_circle()
+        await super().async_shutdown()
+
+    @callback
+    def async_add_stats_listener(self, update_callback):
+        """Listen for every update, changed or not; returns a callback removing it.
+
+        Instrumentation moves on every poll, including the ones the change
+        check below keeps from the other listeners.
+        """
+        self._stats_listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            self._stats_listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify listeners only if something they show has changed."""
+        for update_callback in list(self._stats_listeners):
+            update_callback()
+        signature = (
+            self.last_update_success,
+            self.stale,
+            self.realtime,
+            self.rad,
+            self.station_signature,
+            self.departures.signature(),
+        )
+        if signature == self._notified_signature:
+            _LOGGER.debug("Transport data unchanged, skipping listener update")
+            return
+        self._notified_signature = signature
+        super().async_update_listeners()
+
+    def elapsed(self) -> float:
+        """Return the seconds since the data was fetched, for ETA interpolation."""
+        if self.fetched_at is None:
+            return 0
+        return time.monotonic() - self.fetched_at
+
+    def _can_serve_stale(self) -> bool:
+        """Return True if the last good data is recent enough to keep serving."""
+        return (
+            self._last_good_at is not None
+            and time.monotonic() - self._last_good_at < STALE_DATA_MAX_AGE
+        )
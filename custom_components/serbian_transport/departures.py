@@ -0,0 +1,138 @@
+"""Departure index built once per coordinator refresh."""
+from __future__ import annotations
+
+import heapq
+from typing import Any, Dict, Iterable, List, Optional
+
+from .const import DEPARTURES_TOP_N
+from .models import Station
+
+
+def upcoming(departures: List[Departure], elapsed: float = 0) -> List[Departure]:
+    """Return the sorted ``departures`` that have not left ``elapsed`` seconds after the fetch."""
+    for position, departure in enumerate(departures):
+        if departure.seconds > elapsed:
+            return departures[position:]
+    return []
+
+
+class Departure:
+    """A single upcoming vehicle at a station."""
+
+    __slots__ = ("seconds", "station", "stop_id", "line", "destination", "stations_between")
+
+    def __init__(
+        self,
+        seconds: int,
+        station: str,
+        stop_id: Any,
+        line: str,
+        destination: str,
+        stations_between: int,
+    ) -> None:
+        """Initialize the departure."""
+        self.seconds = seconds
+        self.station = station
+        self.stop_id = stop_id
+        self.line = line
+        self.destination = destination
+        self.stations_between = stations_between
+
+    @property
+    def minutes(self) -> int:
+        """Return the minutes until departure, at least 1."""
+        return max(1, int(self.seconds / 60))
+
+    def minutes_at(self, elapsed: float) -> int:
+        """Return the minutes until departure, ``elapsed`` seconds after the fetch."""
+        return max(1, int((self.seconds - elapsed) / 60))
+
+    def as_dict(self, elapsed: float = 0) -> Dict[str, Any]:
+        """Return the departure as a state attribute entry."""
+        return {
+            "station": self.station,
+            "line": self.line,
+            "destination": self.destination,
+            "minutes": self.minutes_at(elapsed),
+            "stations_between": self.stations_between,
+        }
+
+
+class DepartureIndex:
+    """Departures of one refresh, pre-sorted and grouped for the sensors."""
+
+    __slots__ = ("count", "top", "by_line", "by_station")
+
+    def __init__(
+        self,
+        count: int = 0,
+        top: Optional[List[Departure]] = None,
+        by_line: Optional[Dict[str, List[Departure]]] = None,
+        by_station: Optional[Dict[str, List[Departure]]] = None,
+    ) -> None:
+        """Initialize the index."""
+        self.count = count
+        self.top = top or []
+        self.by_line = by_line or {}
+        self.by_station = by_station or {}
+
+    @classmethod
+    def build(
+        cls, stations: Optional[Iterable[Station]], top_n: int = DEPARTURES_TOP_N
+    ) -> DepartureIndex:
+        """Build the index in a single pass over the stations payload."""
+        departures: List[Departure] = []
+        by_line: Dict[str, List[Departure]] = {}
+        by_station: Dict[str, List[Departure]] = {}
+
+        for station in stations or ():
+            for vehicle in station.vehicles:
+                departure = Departure(
+                    vehicle.seconds_left,
+                    station.name,
+                    station.stop_id,
+                    vehicle.line,
+                    vehicle.destination,
+                    vehicle.stations_between,
+                )
+                departures.append(departure)
+                by_line.setdefault(vehicle.line, []).append(departure)
+                by_station.setdefault(station.key, []).append(departure)
+
+        for group in (*by_line.values(), *by_station.values()):
+            group.sort(key=_seconds)
+
+        return cls(
+            len(departures),
+            heapq.nsmallest(top_n, departures, key=_seconds),
+            by_line,
+            by_station,
+        )
+
+    def signature(self) -> int:
+        """Return a hash of what the sensors show, rounded to whole minutes."""
+        return hash((
+            self.count,
+            tuple(
+                (d.stop_id, d.line, d.destination, d.minutes, d.stations_between)
+                for d in self.top
+            ),
+        ))
+
+    @property
+    def next(self) -> Optional[Departure]:
+        """Return the soonest departure."""
+        return self.top[0] if self.top else None
+
+    def upcoming(self, elapsed: float = 0) -> List[Departure]:
+        """Return the top departures that have not left ``elapsed`` seconds after the fetch."""
+        return upcoming(self.top, elapsed)
+
+    def min_minutes(self, elapsed: float = 0) -> Optional[int]:
+        """Return the minutes until the soonest departure still to come."""
+        upcoming = self.upcoming(elapsed)
+        return upcoming[0].minutes_at(elapsed) if upcoming else None
+
+
+def _seconds(departure: Departure) -> int:
+    return departure.seconds
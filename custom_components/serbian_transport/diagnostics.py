@@ -0,0 +1,52 @@
+"""Diagnostics support for Serbian Transport."""
+from __future__ import annotations
+
+from typing import Any, Dict
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.core import HomeAssistant
+
+from .api import async_get_client
+from .const import CITY_BOUNDS, CONF_GTFS, DOMAIN
+
+TO_REDACT = {CONF_LATITUDE, CONF_LONGITUDE, CONF_GTFS, "unique_id"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> Dict[str, Any]:
+    """Return where a location's refreshes spend their time."""
+    client = async_get_client(hass)
+    diagnostics: Dict[str, Any] = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "api": {
+            **client.stats.as_dict(),
+            "open_breakers": [
+                city for city in CITY_BOUNDS if client.breaker(city).is_open
+            ],
+        },
+    }
+
+    coordinator = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    if coordinator is None:
+        return diagnostics
+    diagnostics["coordinator"] = {
+        "search_radius": coordinator.rad,
+        "update_interval": coordinator.update_interval.total_seconds(),
+        "last_update_success": coordinator.last_update_success,
+        "stale": coordinator.stale,
+        "realtime": coordinator.realtime,
+        "data_age": round(coordinator.elapsed(), 1),
+        "streaming": coordinator.streaming,
+        "idle_throttle": coordinator.idle_throttle,
+        "stream_connected": coordinator.stream_connected,
+        "timetable": coordinator.timetable is not None,
+        "frontend_subscribers": coordinator.frontend_subscribers,
+        "idle": coordinator.idle,
+        "station_filter": len(coordinator.station_filter),
+        "line_filter": sorted(coordinator.line_filter),
+        "stats": coordinator.stats.as_dict(),
+    }
+    return diagnostics
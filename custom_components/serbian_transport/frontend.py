@@ -0,0 +1,116 @@
+"""Serve the Lovelace card under a content-hashed URL, precompressed once."""
+from __future__ import annotations
+
+import gzip
+from hashlib import sha256
+from http import HTTPStatus
+from pathlib import Path
+from typing import Dict, Optional
+
+from aiohttp import hdrs, web
+
+from homeassistant.components.http import HomeAssistantView
+
+from .const import DOMAIN
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+CARD_PATH = Path(__file__).parent / "www" / "transport-card.js"
+CARD_BASE_URL = f"/{DOMAIN}"
+CARD_NAME = "transport-card"
+# Fixed URL of earlier versions, still used by manually added dashboard resources
+CARD_URL = f"{CARD_BASE_URL}/{CARD_NAME}.js"
+
+CONTENT_TYPE = "application/javascript; charset=utf-8"
+CACHE_IMMUTABLE = "public, max-age=31536000, immutable"
+CACHE_REVALIDATE = "no-cache"
+
+
+class CardAsset:
+    """The card's bytes with their content hash and compressed variants."""
+
+    def __init__(self, body: bytes) -> None:
+        """Hash the card; compressed variants are added by compress()."""
+        self.digest = sha256(body).hexdigest()[:12]
+        self.etag = f'"{self.digest}"'
+        self.url = f"{CARD_BASE_URL}/{CARD_NAME}.{self.digest}.js"
+        self.variants: Dict[Optional[str], bytes] = {None: body}
+
+    def compress(self) -> None:
+        """Add the gzip and brotli variants; blocking, run in the executor."""
+        body = self.variants[None]
+        variants: Dict[Optional[str], bytes] = {
+            None: body,
+            "gzip": gzip.compress(body, compresslevel=9, mtime=0),
+        }
+        if brotli is not None:
+            variants["br"] = brotli.compress(body, mode=brotli.MODE_TEXT)
+        # Swapped in whole: requests served meanwhile see one consistent set
+        self.variants = variants
+
+    @classmethod
+    def load(cls, path: Path = CARD_PATH) -> CardAsset:
+        """Read the card from disk."""
+        return cls(path.read_bytes())
+
+    def negotiate(self, accept_encoding: str) -> Optional[str]:
+        """Return the best encoding the client accepts, None for identity."""
+        accepted = set()
+        for token in accept_encoding.split(","):
+            encoding, *params = (part.strip() for part in token.split(";"))
+            quality = 1.0
+            for param in params:
+                if param.startswith("q="):
+                    try:
+                        quality = float(param[2:])
+                    except ValueError:
+                        quality = 0.0
+            if quality > 0:
+                accepted.add(encoding.lower())
+        for encoding in ("br", "gzip"):
+            if encoding in accepted and encoding in self.variants:
+                return encoding
+        return None
+
+
+class CardView(HomeAssistantView):
+    """Serve the card; the hashed URL is cached forever, the fixed one revalidated."""
+
+    url = f"{CARD_BASE_URL}/{{filename}}"
+    name = f"{DOMAIN}:card"
+    requires_auth = False
+
+    def __init__(self, asset: CardAsset) -> None:
+        """Initialize the view."""
+        self._asset = asset
+
+    async def get(self, request: web.Request, filename: str) -> web.Response:
+        """Return the card in the best encoding the browser accepts."""
+        asset = self._asset
+        if filename == f"{CARD_NAME}.{asset.digest}.js":
+            cache_control = CACHE_IMMUTABLE
+        elif filename == f"{CARD_NAME}.js":
+            cache_control = CACHE_REVALIDATE
+        else:
+            # Another build's hash: let the browser reload the page's current one
+            raise web.HTTPNotFound
+
+        headers = {
+            hdrs.CACHE_CONTROL: cache_control,
+            hdrs.ETAG: asset.etag,
+            hdrs.VARY: hdrs.ACCEPT_ENCODING,
+        }
+        if request.headers.get(hdrs.IF_NONE_MATCH) == asset.etag:
+            return web.Response(status=HTTPStatus.NOT_MODIFIED, headers=headers)
+
+        variants = asset.variants
+        encoding = asset.negotiate(request.headers.get(hdrs.ACCEPT_ENCODING, ""))
+        if encoding not in variants:
+            encoding = None
+        if encoding is not None:
+            headers[hdrs.CONTENT_ENCODING] = encoding
+        headers[hdrs.CONTENT_TYPE] = CONTENT_TYPE
+        return web.Response(body=variants[encoding], headers=headers)
@@ -0,0 +1,83 @@
+"""Geographic helpers for the Serbian Transport integration."""
+from __future__ import annotations
+
+from math import asin, cos, floor, radians, sin, sqrt
+from typing import Dict, List, Tuple
+
+from .models import Station
+
+EARTH_RADIUS_M = 6371000.0
+METERS_PER_DEGREE = 111320.0
+
+# (min_lat, min_lon, max_lat, max_lon)
+BoundingBox = Tuple[float, float, float, float]
+
+
+def haversine_m(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two points in meters."""
+    dlat = radians(lat2 - lat1)
+    dlon = radians(lon2 - lon1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlon / 2) ** 2
+    return 2 * EARTH_RADIUS_M * asin(sqrt(a))
+
+
+def circle_intersects_bbox(lat: float, lon: float, rad: float, bbox: BoundingBox) -> bool:
+    """Return True if the circle around (lat, lon) reaches into the bounding box."""
+    min_lat, min_lon, max_lat, max_lon = bbox
+    nearest_lat = min(max(lat, min_lat), max_lat)
+    nearest_lon = min(max(lon, min_lon), max_lon)
+    return haversine_m(lat, lon, nearest_lat, nearest_lon) <= rad
+
+
+class StationIndex:
+    """Grid of station coordinates for local radius and nearest-K queries.
+
+    Stations are bucketed into cells of ``cell_size`` degrees, so a query
+    only measures distances to stations in the cells its circle touches.
+    """
+
+    def __init__(self, stations: List[Station], cell_size: float = 0.005) -> None:
+        """Build the index; stations without coordinates are left out."""
+        self._cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[Tuple[float, float, Station]]] = {}
+        self.size = 0
+        self.complete = True
+        for station in stations:
+            if station.lat is None or station.lon is None:
+                self.complete = False
+                continue
+            self._cells.setdefault(self._cell(station.lat, station.lon), []).append(
+                (station.lat, station.lon, station)
+            )
+            self.size += 1
+
+    def _cell(self, lat: float, lon: float) -> Tuple[int, int]:
+        return floor(lat / self._cell_size), floor(lon / self._cell_size)
+
+    def within(self, lat: float, lon: float, rad: float) -> List[Tuple[float, Station]]:
+        """Return (distance, station) pairs inside the circle, nearest first."""
+        dlat = rad / METERS_PER_DEGREE
+        dlon = rad / (METERS_PER_DEGREE * max(cos(radians(lat)), 0.01))
+        min_row, min_col = self._cell(lat - dlat, lon - dlon)
+        max_row, max_col = self._cell(lat + dlat, lon + dlon)
+
+        found = []
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                for station_lat, station_lon, station in self._cells.get((row, col), ()):
+                    distance = haversine_m(lat, lon, station_lat, station_lon)
+                    if distance <= rad:
+                        found.append((distance, station))
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def nearest(
+        self, lat: float, lon: float, count: int, max_rad: float = 50000
+    ) -> List[Tuple[float, Station]]:
+        """Return up to ``count`` (distance, station) pairs nearest to the point."""
+        rad = self._cell_size * METERS_PER_DEGREE
+        while True:
+            found = self.within(lat, lon, rad)
+            if len(found) >= count or len(found) == self.size or rad >= max_rad:
+                return found[:count]
+            rad *= 2
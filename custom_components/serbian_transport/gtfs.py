@@ -0,0 +1,374 @@
+"""Offline timetable from a GTFS static feed, served when the live API is down."""
+from __future__ import annotations
+
+from contextlib import closing
+import csv
+from dataclasses import replace
+from datetime import date, datetime, timedelta
+import io
+import logging
+from math import cos, radians
+import os
+import sqlite3
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+import zipfile
+
+from .geo import METERS_PER_DEGREE, haversine_m
+from .models import Station, Vehicle
+
+_LOGGER = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 1
+MATCH_RADIUS = 50  # meters between a live station and the timetable stops it stands for
+IMPORT_BATCH = 50000  # rows per executemany while importing
+WEEKDAYS = ("monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday")
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE stops (
+    stop_id TEXT PRIMARY KEY, code TEXT, name TEXT, lat REAL, lon REAL
+) WITHOUT ROWID;
+CREATE TABLE routes (route_id TEXT PRIMARY KEY, line TEXT) WITHOUT ROWID;
+CREATE TABLE trips (
+    id INTEGER PRIMARY KEY, trip_id TEXT UNIQUE, route_id TEXT, service_id TEXT, headsign TEXT
+);
+CREATE TABLE stop_times (stop_id TEXT, departure INTEGER, trip INTEGER);
+CREATE TABLE calendar (
+    service_id TEXT PRIMARY KEY, days INTEGER, start INTEGER, end INTEGER
+) WITHOUT ROWID;
+CREATE TABLE calendar_dates (service_id TEXT, date INTEGER, added INTEGER);
+"""
+
+# Created after the bulk insert, which is much faster than maintaining them row by row
+INDEXES = """
+CREATE INDEX stop_times_stop_departure ON stop_times (stop_id, departure);
+CREATE INDEX stops_lat ON stops (lat);
+CREATE INDEX calendar_dates_date ON calendar_dates (date);
+"""
+
+
+class GtfsError(Exception):
+    """Raised when a GTFS feed cannot be imported."""
+
+
+def parse_time(value: str) -> Optional[int]:
+    """Return a GTFS H:MM:SS time as seconds into the service day (may exceed 24h)."""
+    try:
+        hours, minutes, seconds = value.strip().split(":")
+        return int(hours) * 3600 + int(minutes) * 60 + int(seconds)
+    except ValueError:
+        return None  # blank for stops that are not timepoints
+
+
+def _date_key(day: date) -> int:
+    return day.year * 10000 + day.month * 100 + day.day
+
+
+def _rows(feed: zipfile.ZipFile, name: str) -> Iterator[Dict[str, str]]:
+    """Stream the rows of one feed file; missing optional files yield nothing."""
+    try:
+        handle = feed.open(name)
+    except KeyError:
+        return
+    with io.TextIOWrapper(handle, encoding="utf-8-sig", newline="") as text:
+        yield from csv.DictReader(text)
+
+
+def _batched(rows: Iterable[tuple]) -> Iterator[List[tuple]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= IMPORT_BATCH:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _feed_signature(feed_path: str) -> str:
+    stat = os.stat(feed_path)
+    return f"{SCHEMA_VERSION}:{stat.st_size}:{int(stat.st_mtime)}"
+
+
+def import_feed(feed_path: str, db_path: str) -> None:
+    """Import a GTFS zip into a fresh SQLite database at ``db_path``.
+
+    Only what departure queries need is kept: stop positions, line numbers,
+    headsigns, service calendars and one departure time per stop visit.
+    """
+    tmp_path = f"{db_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+    try:
+        with zipfile.ZipFile(feed_path) as feed, closing(sqlite3.connect(tmp_path)) as db:
+            db.executescript(SCHEMA)
+            db.executemany(
+                "INSERT OR REPLACE INTO stops VALUES (?, ?, ?, ?, ?)",
+                (
+                    (
+                        row["stop_id"],
+                        row.get("stop_code") or None,
+                        row.get("stop_name") or row["stop_id"],
+                        float(row["stop_lat"]),
+                        float(row["stop_lon"]),
+                    )
+                    for row in _rows(feed, "stops.txt")
+                    if row.get("stop_lat") and row.get("stop_lon")
+                ),
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO routes VALUES (?, ?)",
+                (
+                    (
+                        row["route_id"],
+                        row.get("route_short_name")
+                        or row.get("route_long_name")
+                        or row["route_id"],
+                    )
+                    for row in _rows(feed, "routes.txt")
+                ),
+            )
+            db.executemany(
+                "INSERT OR REPLACE INTO trips (trip_id, route_id, service_id, headsign)"
+                " VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        row["trip_id"],
+                        row["route_id"],
+                        row["service_id"],
+                        row.get("trip_headsign") or "",
+                    )
+                    for row in _rows(feed, "trips.txt")
+                ),
+            )
+            trips = dict(db.execute("SELECT trip_id, id FROM trips"))
+
+            def stop_times() -> Iterator[tuple]:
+                for row in _rows(feed, "stop_times.txt"):
+                    departure = parse_time(
+                        row.get("departure_time") or row.get("arrival_time") or ""
+                    )
+                    trip = trips.get(row["trip_id"])
+                    if departure is not None and trip is not None:
+                        yield row["stop_id"], departure, trip
+
+            for batch in _batched(stop_times()):
+                db.executemany("INSERT INTO stop_times VALUES (?, ?, ?)", batch)
+            db.executemany(
+                "INSERT OR REPLACE INTO calendar VALUES (?, ?, ?, ?)",
+                (
+                    (
+                        row["service_id"],
+                        sum(1 << bit for bit, day in enumerate(WEEKDAYS) if row.get(day) == "1"),
+                        int(row["start_date"]),
+                        int(row["end_date"]),
+                    )
+                    for row in _rows(feed, "calendar.txt")
+                ),
+            )
+            db.executemany(
+                "INSERT INTO calendar_dates VALUES (?, ?, ?)",
+                (
+                    (row["service_id"], int(row["date"]), int(row["exception_type"] == "1"))
+                    for row in _rows(feed, "calendar_dates.txt")
+                ),
+            )
+            db.executescript(INDEXES)
+            db.execute("INSERT INTO meta VALUES ('signature', ?)", (_feed_signature(feed_path),))
+            db.commit()
+    except (OSError, KeyError, ValueError, csv.Error, zipfile.BadZipFile, sqlite3.Error) as err:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise GtfsError(f"Cannot import GTFS feed {feed_path}: {err}") from err
+    os.replace(tmp_path, db_path)
+
+
+class GtfsTimetable:
+    """Scheduled departures looked up in an imported GTFS feed.
+
+    Methods do blocking SQLite I/O and must run in the executor. Each call
+    opens its own read connection, so executor threads never share one.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        """Initialize the timetable over an imported database."""
+        self._db_path = db_path
+        self._services: Dict[int, Set[str]] = {}
+
+    @classmethod
+    def open(cls, feed_path: str, db_path: str) -> GtfsTimetable:
+        """Return the timetable of a feed, importing it if new or changed."""
+        try:
+            signature = _feed_signature(feed_path)
+        except OSError as err:
+            raise GtfsError(f"Cannot read GTFS feed {feed_path}: {err}") from err
+        if _stored_signature(db_path) != signature:
+            _LOGGER.info("Importing GTFS feed %s", feed_path)
+            import_feed(feed_path, db_path)
+        return cls(db_path)
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(f"file:{self._db_path}?mode=ro", uri=True)
+
+    def stops_within(
+        self, db: sqlite3.Connection, lat: float, lon: float, rad: float
+    ) -> List[Tuple[str, Optional[str], str, float, float]]:
+        """Return the (stop_id, code, name, lat, lon) of the stops inside a circle."""
+        dlat = rad / METERS_PER_DEGREE
+        dlon = rad / (METERS_PER_DEGREE * max(cos(radians(lat)), 0.01))
+        rows = db.execute(
+            "SELECT stop_id, code, name, lat, lon FROM stops"
+            " WHERE lat BETWEEN ? AND ? AND lon BETWEEN ? AND ?",
+            (lat - dlat, lat + dlat, lon - dlon, lon + dlon),
+        )
+        return [row for row in rows if haversine_m(lat, lon, row[3], row[4]) <= rad]
+
+    def _active_services(self, db: sqlite3.Connection, day: date) -> Set[str]:
+        """Return the service ids running on ``day``, cached per date.
+
+        Locations share the timetable from several executor threads, so the
+        cache is only read once per call and may be cleared in between.
+        """
+        key = _date_key(day)
+        services = self._services.get(key)
+        if services is not None:
+            return services
+        services = {
+            service_id
+            for service_id, days in db.execute(
+                "SELECT service_id, days FROM calendar WHERE start <= ? AND end >= ?",
+                (key, key),
+            )
+            if days & (1 << day.weekday())
+        }
+        for service_id, added in db.execute(
+            "SELECT service_id, added FROM calendar_dates WHERE date = ?", (key,)
+        ):
+            if added:
+                services.add(service_id)
+            else:
+                services.discard(service_id)
+        if len(self._services) > 3:
+            self._services.clear()  # only today and yesterday are ever asked for
+        self._services[key] = services
+        return services
+
+    def departures(
+        self,
+        db: sqlite3.Connection,
+        stop_ids: Sequence[str],
+        now: datetime,
+        horizon: int,
+    ) -> Dict[str, List[Vehicle]]:
+        """Return the scheduled vehicles leaving each stop in the next ``horizon`` seconds."""
+        found: Dict[str, List[Vehicle]] = {}
+        if not stop_ids:
+            return found
+        placeholders = ",".join("?" * len(stop_ids))
+        seconds_now = now.hour * 3600 + now.minute * 60 + now.second
+        # Trips of yesterday's service day run past midnight with times over 24:00:00
+        for day, offset in ((now.date() - timedelta(days=1), 86400), (now.date(), 0)):
+            services = self._active_services(db, day)
+            start = seconds_now + offset
+            rows = db.execute(
+                "SELECT st.stop_id, st.departure, r.line, t.headsign, t.service_id"
+                " FROM stop_times st JOIN trips t ON t.id = st.trip"
+                " LEFT JOIN routes r ON r.route_id = t.route_id"
+                f" WHERE st.stop_id IN ({placeholders}) AND st.departure BETWEEN ? AND ?",
+                (*stop_ids, start, start + horizon),
+            )
+            for stop_id, departure, line, headsign, service_id in rows:
+                if service_id in services:
+                    found.setdefault(stop_id, []).append(
+                        Vehicle(
+                            line=str(line),
+                            destination=headsign or "Unknown",
+                            seconds_left=departure - start,
+                            stations_between=0,
+                            realtime=False,
+                        )
+                    )
+        for vehicles in found.values():
+            vehicles.sort(key=lambda vehicle: vehicle.seconds_left)
+        return found
+
+    def stations(
+        self,
+        known: Iterable[Station],
+        lat: float,
+        lon: float,
+        rad: float,
+        now: datetime,
+        horizon: int,
+    ) -> List[Station]:
+        """Return scheduled departures for a location.
+
+        Live stations with coordinates keep their identity and get the
+        departures of the timetable stops within MATCH_RADIUS of them, so
+        per-station entities carry on. Without any, the timetable stops in
+        the search circle are returned as they are.
+        """
+        with closing(self._connect()) as db:
+            known = [station for station in known if station.lat is not None]
+            if known:
+                matches = {
+                    station.key: [
+                        stop[0]
+                        for stop in self.stops_within(db, station.lat, station.lon, MATCH_RADIUS)
+                    ]
+                    for station in known
+                }
+                stations = known
+            else:
+                stops = self.stops_within(db, lat, lon, rad)
+                stations = [
+                    Station(
+                        stop_id=code or stop_id, name=name, city="gtfs", lat=stop_lat, lon=stop_lon
+                    )
+                    for stop_id, code, name, stop_lat, stop_lon in stops
+                ]
+                matches = {station.key: [stop[0]] for station, stop in zip(stations, stops)}
+
+            departures = self.departures(
+                db, sorted({stop_id for ids in matches.values() for stop_id in ids}), now, horizon
+            )
+
+        result = []
+        for station in stations:
+            vehicles = sorted(
+                (
+                    vehicle
+                    for stop_id in matches[station.key]
+                    for vehicle in departures.get(stop_id, ())
+                ),
+                key=lambda vehicle: vehicle.seconds_left,
+            )
+            result.append(replace(station, vehicles=tuple(vehicles)))
+        return result
+
+    def lines_near(self, lat: float, lon: float, rad: float) -> List[str]:
+        """Return the line numbers scheduled to serve the stops in a circle."""
+        with closing(self._connect()) as db:
+            stop_ids = [stop[0] for stop in self.stops_within(db, lat, lon, rad)]
+            if not stop_ids:
+                return []
+            placeholders = ",".join("?" * len(stop_ids))
+            rows = db.execute(
+                "SELECT DISTINCT r.line FROM stop_times st JOIN trips t ON t.id = st.trip"
+                " JOIN routes r ON r.route_id = t.route_id"
+                f" WHERE st.stop_id IN ({placeholders})",
+                stop_ids,
+            )
+            return [str(line) for line, in rows]
+
+
+def _stored_signature(db_path: str) -> Optional[str]:
+    """Return the feed signature an existing database was imported from."""
+    if not os.path.exists(db_path):
+        return None
+    try:
+        with closing(sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)) as db:
+            row = db.execute("SELECT value FROM meta WHERE key = 'signature'").fetchone()
+    except sqlite3.Error:
+        return None
+    return row[0] if row else None
@@ -0,0 +1,136 @@
+"""Typed records for transport API payloads, validated once at the edge."""
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Any, Dict, List, Optional, Tuple
+
+
+@dataclass(slots=True, frozen=True)
+class Vehicle:
+    """A vehicle approaching a station."""
+
+    line: str
+    destination: str
+    seconds_left: int
+    stations_between: int
+    realtime: bool = True  # False for departures taken from the timetable
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the vehicle in the API's shape, as the card expects it."""
+        return {
+            "lineNumber": self.line,
+            "lineName": self.destination,
+            "secondsLeft": self.seconds_left,
+            "stationsBetween": self.stations_between,
+            "realtime": self.realtime,
+        }
+
+
+@dataclass(slots=True, frozen=True)
+class Station:
+    """A station with its approaching vehicles.
+
+    Records are immutable so one parsed payload can be shared between
+    locations and reused on 304 responses; derive changed copies with
+    ``dataclasses.replace``.
+    """
+
+    stop_id: Any
+    name: str
+    city: str = ""
+    lat: Optional[float] = None
+    lon: Optional[float] = None
+    distance: Optional[float] = None
+    vehicles: Tuple[Vehicle, ...] = ()
+
+    @property
+    def key(self) -> str:
+        """Return the key identifying the station across cities."""
+        return f"{self.city}:{self.stop_id}"
+
+    def aged(self, seconds: int) -> Station:
+        """Return the station as seen ``seconds`` after its arrival times were taken.
+
+        Vehicles that have arrived in the meantime are dropped.
+        """
+        if not seconds:
+            return self
+        return replace(
+            self,
+            vehicles=tuple(
+                replace(vehicle, seconds_left=vehicle.seconds_left - seconds)
+                for vehicle in self.vehicles
+                if vehicle.seconds_left >= seconds
+            ),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the station in the API's shape, as the card expects it."""
+        return {
+            "stopId": self.stop_id,
+            "name": self.name,
+            "city": self.city,
+            "lat": self.lat,
+            "lon": self.lon,
+            "distance": self.distance,
+            "vehicles": [vehicle.as_dict() for vehicle in self.vehicles],
+        }
+
+    @classmethod
+    def from_dict(cls, raw: Dict[str, Any], city: str = "") -> Station:
+        """Build a station from an API (or cached) dict, coercing field types."""
+        lat, lon = _coordinates(raw)
+        distance = raw.get("distance")
+        return cls(
+            stop_id=raw.get("stopId"),
+            name=str(raw.get("name") or f"Station {raw.get('stopId')}"),
+            city=raw.get("city") or city,
+            lat=lat,
+            lon=lon,
+            distance=float(distance) if distance is not None else None,
+            vehicles=tuple(_parse_vehicles(raw.get("vehicles"))),
+        )
+
+
+def parse_stations(payload: Any, city: str = "") -> List[Station]:
+    """Validate a decoded stations payload and convert it to records."""
+    if not isinstance(payload, list):
+        raise ValueError(f"Expected a list of stations, got {type(payload).__name__}")
+    return [Station.from_dict(raw, city) for raw in payload if isinstance(raw, dict)]
+
+
+def _parse_vehicles(raw_vehicles: Any) -> List[Vehicle]:
+    """Convert vehicles, dropping entries without a usable arrival time."""
+    vehicles = []
+    for raw in raw_vehicles or ():
+        if not isinstance(raw, dict):
+            continue
+        try:
+            seconds_left = int(raw["secondsLeft"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        vehicles.append(
+            Vehicle(
+                line=str(raw.get("lineNumber", "Unknown")),
+                destination=str(raw.get("lineName", "Unknown")),
+                seconds_left=seconds_left,
+                stations_between=int(raw.get("stationsBetween") or 0),
+            )
+        )
+    return vehicles
+
+
+def _coordinates(raw: Dict[str, Any]) -> Tuple[Optional[float], Optional[float]]:
+    """Return the (lat, lon) of a station dict, if it carries them."""
+    for lat_key, lon_key in (("lat", "lon"), ("latitude", "longitude")):
+        if raw.get(lat_key) is not None and raw.get(lon_key) is not None:
+            return float(raw[lat_key]), float(raw[lon_key])
+    coords = raw.get("coords") or raw.get("coordinates")
+    if isinstance(coords, dict):
+        lat = coords.get("lat", coords.get("latitude"))
+        lon = coords.get("lon", coords.get("lng", coords.get("longitude")))
+        if lat is not None and lon is not None:
+            return float(lat), float(lon)
+    elif isinstance(coords, (list, tuple)) and len(coords) == 2:
+        return float(coords[0]), float(coords[1])
+    return None, None
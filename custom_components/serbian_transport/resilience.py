@@ -0,0 +1,63 @@
+"""Retry and circuit breaker helpers for the Serbian Transport API."""
+from __future__ import annotations
+
+import random
+import time
+
+from .const import (
+    DEFAULT_BACKOFF_BASE,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_BREAKER_RECOVERY,
+    DEFAULT_BREAKER_THRESHOLD,
+)
+
+# Response codes worth retrying: the request is a GET, so repeating it is safe
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+def backoff_delay(attempt: int) -> float:
+    """Return a jittered exponential delay before retry number ``attempt``."""
+    ceiling = min(DEFAULT_BACKOFF_MAX, DEFAULT_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(ceiling / 2, ceiling)
+
+
+class CircuitBreaker:
+    """Stop calling a backend after repeated failures.
+
+    After ``threshold`` consecutive failures the breaker opens and rejects
+    calls for ``recovery`` seconds. The first call after that is let through
+    as a probe: success closes the breaker, failure opens it again.
+    """
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_BREAKER_THRESHOLD,
+        recovery: float = DEFAULT_BREAKER_RECOVERY,
+    ) -> None:
+        """Initialize the breaker."""
+        self._threshold = threshold
+        self._recovery = recovery
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while calls are being rejected."""
+        if self._opened_at is None:
+            return False
+        return time.monotonic() - self._opened_at < self._recovery
+
+    def allow_request(self) -> bool:
+        """Return True if a call may be made now."""
+        return not self.is_open
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful call."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed call and open the breaker past the threshold."""
+        self._failures += 1
+        if self._failures >= self._threshold:
+            self._opened_at = time.monotonic()
@@ -1,23 +1,47 @@
 """Serbian Transport sensor platform."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
 import logging
-from typing import Dict, Any, Optional
-from homeassistant.components.sensor import SensorEntity, SensorEntityDescription
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.const import (
+    EntityCategory,
+    UnitOfInformation,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.typing import StateType
 
-from .coordinator import TransportStationsCoordinator
+from .departures import Departure, upcoming
+from .stats import ApiStats
 from .const import (
     DOMAIN, 
+    CONF_LINE_SENSORS,
     CONF_SEARCH_RADIUS, 
+    CONF_STATIONS_ATTRIBUTE,
+    DEFAULT_LINE_SENSORS,
     DEFAULT_SEARCH_RADIUS,
+    DEFAULT_STATIONS_ATTRIBUTE,
+    DEPARTURES_TOP_N,
     SENSOR_TYPES,
     ATTR_STATIONS,
     ATTR_STATION_COUNT
 )
 
+if TYPE_CHECKING:
+    from .coordinator import TransportStationsCoordinator
+
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_platform(
@@ -37,13 +61,17 @@ async def async_setup_platform(
         _LOGGER.error("Latitude and longitude must be configured")
         return
 
+    from .coordinator import TransportStationsCoordinator
+
     coordinator = TransportStationsCoordinator(hass, lat, lon, rad)
-    await coordinator.async_config_entry_first_refresh()
+    # No config entry here: refresh directly, failures are retried on schedule
+    await coordinator.async_refresh()
 
     sensors = [
-        TransportStationsCountSensor(coordinator),
+        TransportStationsCountSensor(coordinator, DOMAIN, "Serbian Transport"),
     ]
-    add_entities(sensors, True)
+    # Data is in already, the sensors need no update of their own before being added
+    add_entities(sensors)
 
 async def async_setup_entry(
     hass: HomeAssistant, 
@@ -51,48 +79,68 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback
 ) -> None:
     """Set up sensors from a config entry."""
-    # Support for both new and legacy config keys for backward compatibility
-    lat = entry.data.get("latitude") or entry.data.get(CONF_LATITUDE, hass.config.latitude)
-    lon = entry.data.get("longitude") or entry.data.get(CONF_LONGITUDE, hass.config.longitude)
-    rad = entry.data.get(CONF_SEARCH_RADIUS) or entry.data.get("search_rad", DEFAULT_SEARCH_RADIUS)
-
-    if lat is None or lon is None:
-        _LOGGER.error("Latitude and longitude must be configured")
-        return
+    from .api import async_get_client
 
-    _LOGGER.debug("Setting up sensors for coordinates (%.6f, %.6f) with radius %dm", lat, lon, rad)
-    _LOGGER.debug("Entry data keys: %s", list(entry.data.keys()))
-    _LOGGER.debug("Entry data values: %s", entry.data)
-
-    coordinator = TransportStationsCoordinator(hass, lat, lon, rad)
-    
-    try:
-        await coordinator.async_config_entry_first_refresh()
-    except Exception as e:
-        _LOGGER.error("Failed to fetch initial data: %s", e)
-        # Continue setup even if initial fetch fails - coordinator will retry
+    coordinator = hass.data[DOMAIN][entry.entry_id]
 
+    expose_stations = entry.options.get(CONF_STATIONS_ATTRIBUTE, DEFAULT_STATIONS_ATTRIBUTE)
     sensors = [
-        TransportStationsCountSensor(coordinator),
-        TransportNextDepartureSensor(coordinator),
+        TransportStationsCountSensor(coordinator, entry.entry_id, entry.title, expose_stations),
+        TransportNextDepartureSensor(coordinator, entry.entry_id, entry.title),
     ]
-    async_add_entities(sensors, True)
+    api_stats = async_get_client(hass).stats
+    sensors.extend(
+        TransportDiagnosticSensor(coordinator, entry.entry_id, entry.title, api_stats, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
+    async_add_entities(sensors)
 
-class TransportStationsCountSensor(SensorEntity):
-    """Sensor that shows the count of nearby transport stations."""
+    line_sensors = entry.options.get(CONF_LINE_SENSORS, DEFAULT_LINE_SENSORS)
+    known: set[str] = set()
+
+    @callback
+    def _async_add_new_entities() -> None:
+        """Create station (and line) sensors as they first appear in the data."""
+        new_entities: list[SensorEntity] = []
+        for key in coordinator.stations_by_key:
+            if f"station:{key}" not in known:
+                known.add(f"station:{key}")
+                new_entities.append(
+                    TransportStationSensor(coordinator, entry.entry_id, entry.title, key)
+                )
+        if line_sensors:
+            for line in coordinator.departures.by_line:
+                if f"line:{line}" not in known:
+                    known.add(f"line:{line}")
+                    new_entities.append(
+                        TransportLineSensor(coordinator, entry.entry_id, entry.title, line)
+                    )
+        if new_entities:
+            async_add_entities(new_entities)
+
+    _async_add_new_entities()
+    entry.async_on_unload(coordinator.async_add_listener(_async_add_new_entities))
+
+class TransportSensor(SensorEntity, ABC):
+    """Base class for sensors fed by the transport coordinator."""
 
     _attr_has_entity_name = True
-    _attr_name = "Stations Count"
-    _attr_icon = "mdi:bus-stop"
-    _attr_native_unit_of_measurement = "stations"
 
-    def __init__(self, coordinator: TransportStationsCoordinator) -> None:
-        """Initialize the sensor."""
+    def __init__(
+        self, coordinator: TransportStationsCoordinator, unique_prefix: str, location: str
+    ) -> None:
+        """Initialize the sensor.
+
+        ``unique_prefix`` scopes unique IDs and the device to one location:
+        the config entry ID, or the domain for the legacy YAML setup.
+        """
         self._coordinator = coordinator
-        self._attr_unique_id = f"{DOMAIN}_stations_count"
+        self._unique_prefix = unique_prefix
+        self._written_signature = None
+        device_id = "transport_stations" if unique_prefix == DOMAIN else unique_prefix
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, "transport_stations")},
-            "name": "Serbian Transport",
+            "identifiers": {(DOMAIN, device_id)},
+            "name": location,
             "manufacturer": "Serbian Transport Integration",
             "model": "Transport Monitor",
         }
@@ -102,6 +150,63 @@ class TransportStationsCountSensor(SensorEntity):
         """Disable polling - we use coordinator."""
         return False
 
+    @abstractmethod
+    def _signature(self) -> Any:
+        """Return a value that changes whenever the state shown changes."""
+
+    @property
+    def extra_state_attributes(self) -> Optional[Dict[str, Any]]:
+        """Return the state attributes, timing how long they take to build."""
+        started = time.perf_counter()
+        attributes = self._attributes()
+        self._coordinator.stats.attributes_ms.record((time.perf_counter() - started) * 1000)
+        return attributes
+
+    def _attributes(self) -> Optional[Dict[str, Any]]:
+        """Return the state attributes."""
+        return None
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only if what this sensor shows has changed."""
+        signature = (self.available, self._signature())
+        if signature == self._written_signature:
+            return
+        self._written_signature = signature
+        self.async_write_ha_state()
+
+    async def async_added_to_hass(self) -> None:
+        """Register callbacks."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self._async_add_listener())
+
+    def _async_add_listener(self) -> Callable[[], None]:
+        """Listen for coordinator updates that change the transport data."""
+        return self._coordinator.async_add_listener(self._handle_coordinator_update)
+
+
+class TransportStationsCountSensor(TransportSensor):
+    """Sensor that shows the count of nearby transport stations."""
+
+    _attr_name = "Stations Count"
+    _attr_icon = "mdi:bus-stop"
+    _attr_native_unit_of_measurement = "stations"
+    # The full payload is served to the card over the websocket API and must
+    # never end up in the recorder database.
+    _unrecorded_attributes = frozenset({ATTR_STATIONS})
+
+    def __init__(
+        self,
+        coordinator: TransportStationsCoordinator,
+        unique_prefix: str,
+        location: str,
+        expose_stations: bool = True,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, unique_prefix, location)
+        self._expose_stations = expose_stations
+        self._attr_unique_id = f"{unique_prefix}_stations_count"
+
     @property
     def native_value(self) -> Optional[int]:
         """Return the number of stations."""
@@ -112,129 +217,343 @@ class TransportStationsCountSensor(SensorEntity):
         """Return True if sensor is available."""
         return self._coordinator.last_update_success
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
+    def _attributes(self) -> Dict[str, Any]:
         """Return additional state attributes."""
         if not self._coordinator.has_data:
             _LOGGER.debug("No coordinator data available for stations count sensor")
             return {}
         
-        stations_data = self._coordinator.data
-        _LOGGER.debug("Stations count sensor returning %d stations: %s", 
-                     len(stations_data) if stations_data else 0, 
-                     [s.get('name', 'Unknown') for s in stations_data[:3]] if stations_data else [])
-        
-        return {
-            ATTR_STATIONS: stations_data,
+        attributes = {
             ATTR_STATION_COUNT: self._coordinator.station_count,
             "last_update_success": self._coordinator.last_update_success,
+            "stale": self._coordinator.stale,
+            "realtime": self._coordinator.realtime,
             "search_radius": self._coordinator.rad,
             "coordinates": f"{self._coordinator.lat:.6f}, {self._coordinator.lon:.6f}"
         }
+        if self._expose_stations:
+            attributes[ATTR_STATIONS] = [
+                station.as_dict() for station in self._coordinator.data or []
+            ]
+        return attributes
+
+    def _signature(self) -> Any:
+        """Return the station count, or the whole station set when it is exposed."""
+        return (
+            self._coordinator.stale,
+            self._coordinator.realtime,
+            self._coordinator.rad,
+            self._coordinator.station_signature
+            if self._expose_stations
+            else self._coordinator.station_count,
+        )
+
+
+class TransportDepartureSensor(TransportSensor):
+    """Base class for sensors counting down to a departure between polls."""
+
+    _attr_native_unit_of_measurement = "min"
+
+    def __init__(
+        self, coordinator: TransportStationsCoordinator, unique_prefix: str, location: str
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, unique_prefix, location)
+        self._unsub_tick = None
+
+    @abstractmethod
+    def _departures(self) -> List[Departure]:
+        """Return the departures this sensor covers, soonest first."""
+
+    def _upcoming(self) -> List[Departure]:
+        """Return the covered departures that have not left yet."""
+        return upcoming(self._departures(), self._coordinator.elapsed())
+
+    @property
+    def native_value(self) -> Optional[int]:
+        """Return the time until next departure in minutes, counted down since the fetch."""
+        if not self._coordinator.has_data:
+            return None
+        departures = self._upcoming()
+        if not departures:
+            return None
+        return departures[0].minutes_at(self._coordinator.elapsed())
+
+    @property
+    def available(self) -> bool:
+        """Return True if sensor is available."""
+        return self._coordinator.last_update_success and self._coordinator.has_data
+
+    def _signature(self) -> Any:
+        """Return the interpolated, minute-rounded departures shown by this sensor."""
+        elapsed = self._coordinator.elapsed()
+        departures = self._upcoming()[:DEPARTURES_TOP_N]
+        return (
+            self._coordinator.stale,
+            self._coordinator.realtime,
+            len(self._departures()),
+            tuple((d.stop_id, d.line, d.minutes_at(elapsed)) for d in departures),
+        )
 
     @callback
     def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
+        """Write state if needed and schedule the next local countdown tick."""
+        super()._handle_coordinator_update()
+        self._schedule_tick()
+
+    @callback
+    def _schedule_tick(self) -> None:
+        """Wake up when the next departure's minute value changes between polls."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
+
+        departures = self._upcoming()
+        if not departures:
+            return
+        remaining = departures[0].seconds - self._coordinator.elapsed()
+        # Minutes are floored and clamped to 1, so below two minutes the value
+        # only changes once the vehicle has left.
+        delay = remaining % 60 if remaining >= 120 else remaining
+        self._unsub_tick = async_call_later(self.hass, delay + 0.1, self._async_tick)
+
+    @callback
+    def _async_tick(self, _now: Any) -> None:
+        """Re-evaluate the countdown without a new fetch."""
+        self._unsub_tick = None
+        self._handle_coordinator_update()
 
     async def async_added_to_hass(self) -> None:
-        """Register callbacks."""
+        """Register callbacks and start the countdown."""
         await super().async_added_to_hass()
-        self._coordinator.async_add_listener(self._handle_coordinator_update)
+        self._schedule_tick()
 
     async def async_will_remove_from_hass(self) -> None:
-        """Unregister callbacks."""
-        self._coordinator.async_remove_listener(self._handle_coordinator_update)
+        """Stop the countdown."""
+        if self._unsub_tick is not None:
+            self._unsub_tick()
+            self._unsub_tick = None
         await super().async_will_remove_from_hass()
 
 
-class TransportNextDepartureSensor(SensorEntity):
+class TransportNextDepartureSensor(TransportDepartureSensor):
     """Sensor that shows the next departure time in minutes."""
 
-    _attr_has_entity_name = True
     _attr_name = "Next Departure"
     _attr_icon = "mdi:bus-clock"
-    _attr_native_unit_of_measurement = "min"
 
-    def __init__(self, coordinator: TransportStationsCoordinator) -> None:
+    def __init__(
+        self, coordinator: TransportStationsCoordinator, unique_prefix: str, location: str
+    ) -> None:
         """Initialize the sensor."""
-        self._coordinator = coordinator
-        self._attr_unique_id = f"{DOMAIN}_next_departure"
-        self._attr_device_info = {
-            "identifiers": {(DOMAIN, "transport_stations")},
-            "name": "Serbian Transport",
-            "manufacturer": "Serbian Transport Integration",
-            "model": "Transport Monitor",
-        }
+        super().__init__(coordinator, unique_prefix, location)
+        self._attr_unique_id = f"{unique_prefix}_next_departure"
 
-    @property
-    def should_poll(self) -> bool:
-        """Disable polling - we use coordinator."""
-        return False
+    def _departures(self) -> List[Departure]:
+        """Return the soonest departures across all stations."""
+        return self._coordinator.departures.top
 
-    @property
-    def native_value(self) -> Optional[int]:
-        """Return the time until next departure in minutes."""
+    def _signature(self) -> Any:
+        """Include the total departure count, shown as an attribute."""
+        return (super()._signature(), self._coordinator.departures.count)
+
+    def _attributes(self) -> Dict[str, Any]:
+        """Return additional state attributes."""
         if not self._coordinator.has_data:
-            return None
-            
-        min_departure = None
-        for station in self._coordinator.data:
-            vehicles = station.get("vehicles", [])
-            for vehicle in vehicles:
-                seconds_left = vehicle.get("secondsLeft")
-                if seconds_left is not None:
-                    minutes = max(1, int(seconds_left / 60))  # At least 1 minute
-                    if min_departure is None or minutes < min_departure:
-                        min_departure = minutes
-                        
-        return min_departure
+            return {}
+
+        elapsed = self._coordinator.elapsed()
+        return {
+            "all_departures": [departure.as_dict(elapsed) for departure in self._upcoming()],
+            "departure_count": self._coordinator.departures.count,
+            "last_update_success": self._coordinator.last_update_success,
+            "stale": self._coordinator.stale,
+            "realtime": self._coordinator.realtime,
+        }
+
+
+class TransportStationSensor(TransportDepartureSensor):
+    """Sensor that shows the next departure at one station."""
+
+    _attr_icon = "mdi:bus-stop"
+
+    def __init__(
+        self,
+        coordinator: TransportStationsCoordinator,
+        unique_prefix: str,
+        location: str,
+        key: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, unique_prefix, location)
+        self._key = key
+        station = coordinator.stations_by_key[key]
+        self._attr_unique_id = f"{unique_prefix}_station_{key}"
+        self._attr_name = f"{station.name} #{station.stop_id}"
+        # Dozens of stops may be in range: only those picked in the options
+        # are enabled by default
+        self._attr_entity_registry_enabled_default = key in coordinator.station_filter
+
+    def _departures(self) -> List[Departure]:
+        """Return the departures at this station."""
+        return self._coordinator.departures.by_station.get(self._key, [])
 
     @property
     def available(self) -> bool:
-        """Return True if sensor is available."""
-        return self._coordinator.last_update_success and self._coordinator.has_data
+        """Return True while the station is in the published data."""
+        return super().available and self._key in self._coordinator.stations_by_key
 
-    @property
-    def extra_state_attributes(self) -> Dict[str, Any]:
-        """Return additional state attributes."""
-        if not self._coordinator.has_data:
+    def _attributes(self) -> Dict[str, Any]:
+        """Return the station and its upcoming departures."""
+        station = self._coordinator.stations_by_key.get(self._key)
+        if station is None:
             return {}
-            
-        departures = []
-        for station in self._coordinator.data:
-            vehicles = station.get("vehicles", [])
-            for vehicle in vehicles:
-                seconds_left = vehicle.get("secondsLeft")
-                if seconds_left is not None:
-                    departures.append({
-                        "station": station.get("name", "Unknown"),
-                        "line": vehicle.get("lineNumber", "Unknown"),
-                        "destination": vehicle.get("lineName", "Unknown"),
-                        "minutes": max(1, int(seconds_left / 60)),
-                        "stations_between": vehicle.get("stationsBetween", 0)
-                    })
-        
-        # Sort by departure time
-        departures.sort(key=lambda x: x["minutes"])
-        
+
+        elapsed = self._coordinator.elapsed()
         return {
-            "all_departures": departures[:10],  # Limit to 10 nearest
-            "departure_count": len(departures),
-            "last_update_success": self._coordinator.last_update_success,
+            "stop_id": station.stop_id,
+            "distance": station.distance,
+            "departures": [
+                departure.as_dict(elapsed)
+                for departure in self._upcoming()[:DEPARTURES_TOP_N]
+            ],
+            "stale": self._coordinator.stale,
+            "realtime": self._coordinator.realtime,
         }
 
-    @callback
-    def _handle_coordinator_update(self) -> None:
-        """Handle updated data from the coordinator."""
-        self.async_write_ha_state()
 
-    async def async_added_to_hass(self) -> None:
-        """Register callbacks."""
-        await super().async_added_to_hass()
-        self._coordinator.async_add_listener(self._handle_coordinator_update)
+class TransportLineSensor(TransportDepartureSensor):
+    """Sensor that shows the next departure of one line at any station in range."""
 
-    async def async_will_remove_from_hass(self) -> None:
-        """Unregister callbacks."""
-        self._coordinator.async_remove_listener(self._handle_coordinator_update)
-        await super().async_will_remove_from_hass()
\ No newline at end of file
+    _attr_icon = "mdi:bus"
+
+    def __init__(
+        self,
+        coordinator: TransportStationsCoordinator,
+        unique_prefix: str,
+        location: str,
+        line: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, unique_prefix, location)
+        self._line = line
+        self._attr_unique_id = f"{unique_prefix}_line_{line}"
+        self._attr_name = f"Line {line}"
+
+    def _departures(self) -> List[Departure]:
+        """Return the departures of this line."""
+        return self._coordinator.departures.by_line.get(self._line, [])
+
+    def _attributes(self) -> Dict[str, Any]:
+        """Return the upcoming departures of the line."""
+        elapsed = self._coordinator.elapsed()
+        return {
+            "departures": [
+                departure.as_dict(elapsed)
+                for departure in self._upcoming()[:DEPARTURES_TOP_N]
+            ],
+            "stale": self._coordinator.stale,
+            "realtime": self._coordinator.realtime,
+        }
+
+
+def _ms(value: Optional[float]) -> Optional[float]:
+    return round(value, 2) if value is not None else None
+
+
+@dataclass(frozen=True, kw_only=True)
+class TransportDiagnosticDescription(SensorEntityDescription):
+    """Describes a sensor reading the integration's instrumentation."""
+
+    value_fn: Callable[[TransportStationsCoordinator, ApiStats], StateType]
+
+
+# API figures come from the client shared by every location
+DIAGNOSTIC_SENSORS = (
+    TransportDiagnosticDescription(
+        key="refresh_time",
+        name="Refresh time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, api: _ms(coordinator.stats.refresh_ms.last),
+    ),
+    TransportDiagnosticDescription(
+        key="api_latency",
+        name="API latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, api: _ms(api.latency_ms.last),
+    ),
+    TransportDiagnosticDescription(
+        key="payload_size",
+        name="Payload size",
+        device_class=SensorDeviceClass.DATA_SIZE,
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, api: api.last_bytes,
+    ),
+    TransportDiagnosticDescription(
+        key="decode_time",
+        name="Decode time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, api: _ms(api.decode_ms.last),
+    ),
+    TransportDiagnosticDescription(
+        key="attribute_time",
+        name="Attribute build time",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda coordinator, api: _ms(coordinator.stats.attributes_ms.mean),
+    ),
+    TransportDiagnosticDescription(
+        key="api_retries",
+        name="API retries",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda coordinator, api: api.retries,
+    ),
+)
+
+
+class TransportDiagnosticSensor(TransportSensor):
+    """Instrumentation figure, disabled by default; refreshed after every update."""
+
+    entity_description: TransportDiagnosticDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(
+        self,
+        coordinator: TransportStationsCoordinator,
+        unique_prefix: str,
+        location: str,
+        api_stats: ApiStats,
+        description: TransportDiagnosticDescription,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, unique_prefix, location)
+        self.entity_description = description
+        self._api_stats = api_stats
+        self._attr_unique_id = f"{unique_prefix}_{description.key}"
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the current figure."""
+        return self.entity_description.value_fn(self._coordinator, self._api_stats)
+
+    @property
+    def extra_state_attributes(self) -> None:
+        """No attributes, and none of the timing the other sensors record."""
+        return None
+
+    def _signature(self) -> Any:
+        """Return the figure shown."""
+        return self.native_value
+
+    def _async_add_listener(self) -> Callable[[], None]:
+        """Listen for every update: the figures move even when the data does not."""
+        return self._coordinator.async_add_stats_listener(self._handle_coordinator_update)
@@ -0,0 +1,134 @@
+"""Counters and latency histograms behind the integration's diagnostics."""
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Dict, Optional, Sequence
+
+# Upper bounds in milliseconds
+REQUEST_BUCKETS_MS = (25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+CPU_BUCKETS_MS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50)
+
+
+class Histogram:
+    """Fixed-bucket histogram of durations, cheap enough to record every call."""
+
+    __slots__ = ("bounds", "buckets", "count", "total", "max", "last")
+
+    def __init__(self, bounds: Sequence[float]) -> None:
+        """Initialize the histogram."""
+        self.bounds = tuple(bounds)
+        self.buckets = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.last: Optional[float] = None
+
+    def record(self, value: float) -> None:
+        """Add one observation."""
+        self.buckets[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.last = value
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Return the mean observation, None before the first one."""
+        return self.total / self.count if self.count else None
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the histogram for diagnostics."""
+        labels = [f"<={bound}" for bound in self.bounds] + [f">{self.bounds[-1]}"]
+        return {
+            "count": self.count,
+            "mean": _round(self.mean),
+            "max": _round(self.max),
+            "last": _round(self.last),
+            "buckets": dict(zip(labels, self.buckets)),
+        }
+
+
+class ApiStats:
+    """Traffic of the shared API client, across every location."""
+
+    __slots__ = (
+        "requests",
+        "not_modified",
+        "retries",
+        "failures",
+        "bytes_received",
+        "last_bytes",
+        "latency_ms",
+        "decode_ms",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.requests = 0
+        self.not_modified = 0
+        self.retries = 0
+        self.failures = 0
+        self.bytes_received = 0
+        self.last_bytes: Optional[int] = None
+        self.latency_ms = Histogram(REQUEST_BUCKETS_MS)
+        self.decode_ms = Histogram(CPU_BUCKETS_MS)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "requests": self.requests,
+            "not_modified": self.not_modified,
+            "retries": self.retries,
+            "failures": self.failures,
+            "bytes_received": self.bytes_received,
+            "last_bytes": self.last_bytes,
+            "latency_ms": self.latency_ms.as_dict(),
+            "decode_ms": self.decode_ms.as_dict(),
+        }
+
+
+class CoordinatorStats:
+    """Refreshes of one location and the work they trigger."""
+
+    __slots__ = (
+        "refreshes",
+        "failed_refreshes",
+        "stale_serves",
+        "timetable_serves",
+        "stream_updates",
+        "stations",
+        "vehicles",
+        "refresh_ms",
+        "attributes_ms",
+    )
+
+    def __init__(self) -> None:
+        """Initialize the counters."""
+        self.refreshes = 0
+        self.failed_refreshes = 0
+        self.stale_serves = 0
+        self.timetable_serves = 0
+        self.stream_updates = 0
+        self.stations = 0
+        self.vehicles = 0
+        self.refresh_ms = Histogram(REQUEST_BUCKETS_MS)
+        self.attributes_ms = Histogram(CPU_BUCKETS_MS)
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Return the counters for diagnostics."""
+        return {
+            "refreshes": self.refreshes,
+            "failed_refreshes": self.failed_refreshes,
+            "stale_serves": self.stale_serves,
+            "timetable_serves": self.timetable_serves,
+            "stream_updates": self.stream_updates,
+            "stations": self.stations,
+            "vehicles": self.vehicles,
+            "refresh_ms": self.refresh_ms.as_dict(),
+            "attributes_ms": self.attributes_ms.as_dict(),
+        }
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    return round(value, 3) if value is not None else None
@@ -0,0 +1,222 @@
+"""Optional push transport: station updates streamed over Server-Sent Events."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+import random
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from aiohttp import ClientError, ClientResponseError, ClientSession, ClientTimeout, hdrs
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import json_loads
+
+from .const import (
+    DEFAULT_API_BASE_URL,
+    DEFAULT_CONNECT_TIMEOUT,
+    DOMAIN,
+    STREAM_PATH,
+    STREAM_READ_TIMEOUT,
+    STREAM_RECONNECT_MAX,
+    STREAM_RECONNECT_MIN,
+)
+from .models import Station, parse_stations
+
+_LOGGER = logging.getLogger(__name__)
+
+STREAM_TIMEOUT = ClientTimeout(
+    total=None, connect=DEFAULT_CONNECT_TIMEOUT, sock_read=STREAM_READ_TIMEOUT
+)
+
+# The backend has no stream endpoint: stop trying and keep polling
+UNSUPPORTED_STATUSES = frozenset({404, 405, 501})
+
+
+@dataclass(slots=True)
+class ServerSentEvent:
+    """One dispatched event of a text/event-stream."""
+
+    type: str = "message"
+    data: str = ""
+    id: Optional[str] = None
+    retry: Optional[int] = None  # reconnection time requested by the server, ms
+
+
+class SseDecoder:
+    """Incremental text/event-stream parser fed with raw body chunks."""
+
+    def __init__(self) -> None:
+        """Initialize the decoder."""
+        self._pending = bytearray()
+        self._event = ServerSentEvent()
+        self._data: List[str] = []
+
+    def feed(self, chunk: bytes) -> List[ServerSentEvent]:
+        """Consume a chunk and return the events it completes."""
+        self._pending += chunk
+        if b"\n" not in chunk:
+            # Long snapshots span many chunks: only split once a line ends
+            return []
+        *lines, rest = self._pending.split(b"\n")
+        self._pending = bytearray(rest)
+
+        events = []
+        for raw in lines:
+            line = raw.rstrip(b"\r").decode("utf-8", "replace")
+            if not line:
+                if self._data:
+                    self._event.data = "\n".join(self._data)
+                    events.append(self._event)
+                self._event = ServerSentEvent()
+                self._data = []
+                continue
+            if line.startswith(":"):
+                continue  # comment, used as keepalive
+            field, _, value = line.partition(":")
+            if value.startswith(" "):
+                value = value[1:]
+            if field == "data":
+                self._data.append(value)
+            elif field == "event":
+                self._event.type = value
+            elif field == "id":
+                self._event.id = value
+            elif field == "retry" and value.isdigit():
+                self._event.retry = int(value)
+        return events
+
+
+class StationStream:
+    """Stations of one city backend around a point, kept current by the server.
+
+    The stream opens with a ``snapshot`` event carrying the stations in the
+    circle, in the shape of the stations endpoint, followed by ``diff``
+    events ``{"changed": [stations], "removed": [stop ids]}`` applied to the
+    in-memory state. Dropped streams reconnect with backoff; ``on_drop`` lets
+    the owner poll meanwhile.
+    """
+
+    def __init__(
+        self,
+        session: ClientSession,
+        city: str,
+        circle: Tuple[float, float, float],
+        on_update: Callable[[], None],
+        on_drop: Callable[[], None],
+        base_url: str = DEFAULT_API_BASE_URL,
+    ) -> None:
+        """Initialize the stream."""
+        self.city = city
+        self.connected = False
+        self._session = session
+        self._circle = circle
+        self._on_update = on_update
+        self._on_drop = on_drop
+        self._url = base_url.rstrip("/") + STREAM_PATH.format(city=city)
+        self._stations: Dict[str, Tuple[Station, float]] = {}
+        self._last_event_id: Optional[str] = None
+        self._retry: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @callback
+    def async_start(self, hass: HomeAssistant) -> None:
+        """Start listening in the background."""
+        if self._task is None:
+            self._task = hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} {self.city} stream"
+            )
+
+    @callback
+    def async_stop(self) -> None:
+        """Close the stream."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self.connected = False
+
+    def current(self) -> List[Station]:
+        """Return the streamed stations, arrival times aged to now."""
+        now = time.monotonic()
+        return [
+            station.aged(int(now - received))
+            for station, received in self._stations.values()
+        ]
+
+    async def _async_run(self) -> None:
+        attempt = 0
+        while True:
+            try:
+                await self._async_listen()
+                reason = "closed by server"
+            except ClientResponseError as err:
+                if err.status in UNSUPPORTED_STATUSES:
+                    _LOGGER.warning(
+                        "The %s backend offers no station stream, polling only", self.city
+                    )
+                    self._set_disconnected()
+                    return
+                reason = str(err)
+            except (ClientError, asyncio.TimeoutError, ValueError) as err:
+                reason = str(err) or "timeout"
+
+            if self.connected:
+                attempt = 0
+            self._set_disconnected()
+            ceiling = min(STREAM_RECONNECT_MAX, STREAM_RECONNECT_MIN * 2 ** attempt)
+            delay = self._retry or random.uniform(ceiling / 2, ceiling)
+            attempt += 1
+            _LOGGER.debug(
+                "Station stream for %s dropped (%s), reconnecting in %.0fs",
+                self.city, reason, delay,
+            )
+            await asyncio.sleep(delay)
+
+    async def _async_listen(self) -> None:
+        lat, lon, rad = self._circle
+        headers = {hdrs.ACCEPT: "text/event-stream"}
+        if self._last_event_id is not None:
+            headers["Last-Event-ID"] = self._last_event_id
+        async with self._session.get(
+            self._url,
+            params={"lat": lat, "lon": lon, "rad": rad},
+            headers=headers,
+            timeout=STREAM_TIMEOUT,
+        ) as resp:
+            resp.raise_for_status()
+            decoder = SseDecoder()
+            async for chunk in resp.content.iter_any():
+                for event in decoder.feed(chunk):
+                    self._handle(event)
+
+    def _handle(self, event: ServerSentEvent) -> None:
+        """Apply one event to the station state; raises ValueError on bad payloads."""
+        if event.id is not None:
+            self._last_event_id = event.id
+        if event.retry is not None:
+            self._retry = event.retry / 1000
+
+        now = time.monotonic()
+        if event.type == "snapshot":
+            stations = parse_stations(json_loads(event.data), self.city)
+            self._stations = {station.key: (station, now) for station in stations}
+            if not self.connected:
+                _LOGGER.debug("Station stream for %s connected", self.city)
+            self.connected = True
+        elif event.type == "diff" and self.connected:
+            diff = json_loads(event.data)
+            if not isinstance(diff, dict):
+                raise ValueError(f"Expected a diff object, got {type(diff).__name__}")
+            for station in parse_stations(diff.get("changed", []), self.city):
+                self._stations[station.key] = (station, now)
+            for stop_id in diff.get("removed", []):
+                self._stations.pop(f"{self.city}:{stop_id}", None)
+        else:
+            return
+        self._on_update()
+
+    def _set_disconnected(self) -> None:
+        if self.connected:
+            self.connected = False
+            self._on_drop()
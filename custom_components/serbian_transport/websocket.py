@@ -0,0 +1,127 @@
+"""Websocket commands delivering station payloads to the Lovelace card."""
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Dict, Optional
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.core import HomeAssistant, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
+
+from .const import DOMAIN
+
+if TYPE_CHECKING:
+    from .coordinator import TransportStationsCoordinator
+
+
+@callback
+def async_register_websocket_commands(hass: HomeAssistant) -> None:
+    """Register the station websocket commands."""
+    websocket_api.async_register_command(hass, websocket_get_stations)
+    websocket_api.async_register_command(hass, websocket_subscribe_stations)
+
+
+@callback
+def _async_get_coordinator(
+    hass: HomeAssistant, entity_id: str
+) -> Optional[TransportStationsCoordinator]:
+    """Return the coordinator feeding one of our entities."""
+    entry = er.async_get(hass).async_get(entity_id)
+    if entry is None or entry.platform != DOMAIN:
+        return None
+    return hass.data.get(DOMAIN, {}).get(entry.config_entry_id)
+
+
+def _snapshot(coordinator: TransportStationsCoordinator) -> Dict[str, Any]:
+    """Return the full station payload of a coordinator."""
+    return {
+        "stations": [station.as_dict() for station in coordinator.data or []],
+        "stale": coordinator.stale,
+        "realtime": coordinator.realtime,
+        "age": round(coordinator.elapsed(), 1),
+    }
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/stations",
+        vol.Required("entity_id"): cv.entity_id,
+        vol.Optional("limit"): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+@callback
+def websocket_get_stations(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Return the current stations behind an entity, optionally only the nearest ones."""
+    coordinator = _async_get_coordinator(hass, msg["entity_id"])
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"Unknown entity {msg['entity_id']}"
+        )
+        return
+    coordinator.async_mark_consumed()
+    snapshot = _snapshot(coordinator)
+    if "limit" in msg:
+        snapshot["stations"] = [
+            station.as_dict() for station in coordinator.nearest(msg["limit"])
+        ]
+    connection.send_result(msg["id"], snapshot)
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe_stations",
+        vol.Required("entity_id"): cv.entity_id,
+    }
+)
+@callback
+def websocket_subscribe_stations(
+    hass: HomeAssistant, connection: websocket_api.ActiveConnection, msg: Dict[str, Any]
+) -> None:
+    """Send the stations behind an entity, then only the stations that changed."""
+    coordinator = _async_get_coordinator(hass, msg["entity_id"])
+    if coordinator is None:
+        connection.send_error(
+            msg["id"], websocket_api.ERR_NOT_FOUND, f"Unknown entity {msg['entity_id']}"
+        )
+        return
+
+    previous = {station.key: station for station in coordinator.data or []}
+
+    @callback
+    def forward_changes() -> None:
+        nonlocal previous
+        current = {station.key: station for station in coordinator.data or []}
+        changed = [
+            station for key, station in current.items() if previous.get(key) != station
+        ]
+        removed = [key for key in previous if key not in current]
+        previous = current
+        if changed or removed:
+            connection.send_message(
+                websocket_api.event_message(
+                    msg["id"],
+                    {
+                        "changed": [station.as_dict() for station in changed],
+                        "removed": removed,
+                        "stale": coordinator.stale,
+                        "realtime": coordinator.realtime,
+                        "age": round(coordinator.elapsed(), 1),
+                    },
+                )
+            )
+
+    remove_listener = coordinator.async_add_listener(forward_changes)
+    remove_subscriber = coordinator.async_add_frontend_subscriber()
+
+    @callback
+    def unsubscribe() -> None:
+        remove_listener()
+        remove_subscriber()
+
+    connection.subscriptions[msg["id"]] = unsubscribe
+    connection.send_result(msg["id"])
+    connection.send_message(websocket_api.event_message(msg["id"], _snapshot(coordinator)))
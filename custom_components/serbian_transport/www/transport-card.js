@@ -7,7 +7,8 @@ export class TransportCard extends LitElement {
       hass: { type: Object },
       _config: { state: true },
       _expanded: { state: true },
-      _showNextDeparture: { state: true }
+      _showNextDeparture: { state: true },
+      _stations: { state: true }
     };
   }
 
@@ -15,6 +16,98 @@ export class TransportCard extends LitElement {
     super();
     this._expanded = false;
     this._showNextDeparture = true;
+    this._stations = null;
+    this._stationMap = new Map();
+    this._subscribedEntity = null;
+    this._unsubStations = null;
+    this._fetchedAt = null;
+    this._tickTimer = null;
+    this._entityUpdated = null;
+    this._viewModelCache = null;
+  }
+
+  connectedCallback() {
+    super.connectedCallback();
+    this._subscribeStations();
+    // Re-render periodically so arrival times count down between polls
+    this._tickTimer = setInterval(() => {
+      if (this._fetchedAt !== null) this.requestUpdate();
+    }, 15000);
+  }
+
+  disconnectedCallback() {
+    super.disconnectedCallback();
+    this._unsubscribeStations();
+    clearInterval(this._tickTimer);
+    this._tickTimer = null;
+  }
+
+  // Seconds since the backend fetched the data currently shown
+  _elapsedSeconds() {
+    return this._fetchedAt === null ? 0 : (Date.now() - this._fetchedAt) / 1000;
+  }
+
+  // hass changes on every state change in Home Assistant: only re-render for our entity
+  shouldUpdate(changedProperties) {
+    if (!changedProperties.has('hass') || changedProperties.size > 1) return true;
+    const oldHass = changedProperties.get('hass');
+    const entityState = this.hass?.states[this._config?.entity];
+    const lastUpdated = entityState?.last_updated ?? null;
+    if (oldHass && lastUpdated === this._entityUpdated) return false;
+    this._entityUpdated = lastUpdated;
+    return true;
+  }
+
+  updated(changedProperties) {
+    if (changedProperties.has('hass') || changedProperties.has('_config')) {
+      this._subscribeStations();
+    }
+  }
+
+  // Station payloads come over a websocket subscription instead of entity attributes
+  async _subscribeStations() {
+    const entity = this._config?.entity;
+    if (!this.hass || !entity || !this.isConnected || this._subscribedEntity === entity) return;
+
+    this._unsubscribeStations();
+    this._subscribedEntity = entity;
+    try {
+      const unsub = await this.hass.connection.subscribeMessage(
+        (message) => this._handleStationsMessage(message),
+        { type: 'serbian_transport/subscribe_stations', entity_id: entity }
+      );
+      if (this._subscribedEntity !== entity) {
+        unsub();
+        return;
+      }
+      this._unsubStations = unsub;
+    } catch (err) {
+      // Older integration or a YAML sensor: fall back to the stations attribute
+      this._stations = null;
+    }
+  }
+
+  _unsubscribeStations() {
+    if (this._unsubStations) {
+      this._unsubStations();
+      this._unsubStations = null;
+    }
+    this._subscribedEntity = null;
+    this._stationMap = new Map();
+    this._stations = null;
+    this._fetchedAt = null;
+  }
+
+  _handleStationsMessage(message) {
+    const key = (station) => `${station.city ?? ''}:${station.stopId}`;
+    if (message.stations) {
+      this._stationMap = new Map(message.stations.map(station => [key(station), station]));
+    } else {
+      (message.removed || []).forEach(stationKey => this._stationMap.delete(stationKey));
+      (message.changed || []).forEach(station => this._stationMap.set(key(station), station));
+    }
+    this._stations = Array.from(this._stationMap.values());
+    this._fetchedAt = Date.now() - (message.age || 0) * 1000;
   }
 
   static styles = css`
@@ -387,31 +480,44 @@ export class TransportCard extends LitElement {
 
 
 
-  // Get next departure time from all stations
-  getNextDeparture(stations) {
-    let minTime = null;
-    let nextInfo = null;
-    
-    stations.forEach(station => {
-      const vehicles = station.vehicles || [];
-      vehicles.forEach(vehicle => {
-        const seconds = vehicle.secondsLeft;
-        if (seconds != null) {
-          const minutes = Math.ceil(seconds / 60);
-          if (minTime === null || minutes < minTime) {
-            minTime = minutes;
-            nextInfo = {
-              minutes,
-              line: vehicle.lineNumber,
-              destination: vehicle.lineName,
-              station: station.name
-            };
-          }
-        }
-      });
-    });
-    
-    return nextInfo;
+  // Derived data for rendering, rebuilt only when the stations or the selection change
+  _viewModel(stations) {
+    const { selected_stations: selectedStations, max_stations: maxStations } = this._config;
+    const cached = this._viewModelCache;
+    if (cached && cached.stations === stations && cached.selectedStations === selectedStations
+        && cached.maxStations === maxStations) {
+      return cached;
+    }
+
+    const selected = new Set((selectedStations || []).map(String));
+    const filteredStops = selected.size > 0
+      ? stations.filter(station => selected.has(String(station.stopId)))
+      : stations;
+    const displayStops = filteredStops.slice(0, maxStations).map(stop => ({
+      stop,
+      groups: Object.values(this.groupVehiclesByLine(stop.vehicles)),
+    }));
+    // Every departure of the shown stations, soonest first
+    const departures = filteredStops
+      .flatMap(station => (station.vehicles || [])
+        .filter(vehicle => vehicle.secondsLeft != null)
+        .map(vehicle => ({ vehicle, station })))
+      .sort((a, b) => a.vehicle.secondsLeft - b.vehicle.secondsLeft);
+
+    this._viewModelCache = { stations, selectedStations, maxStations, displayStops, departures };
+    return this._viewModelCache;
+  }
+
+  // Get the next departure, from departures sorted soonest first
+  getNextDeparture(departures, elapsed = 0) {
+    const next = departures.find(({ vehicle }) => vehicle.secondsLeft - elapsed > 0);
+    if (!next) return null;
+    return {
+      minutes: Math.ceil((next.vehicle.secondsLeft - elapsed) / 60),
+      line: next.vehicle.lineNumber,
+      destination: next.vehicle.lineName,
+      station: next.station.name
+    };
   }
 
   // Toggle expanded view
@@ -429,8 +535,11 @@ export class TransportCard extends LitElement {
     return width;
   }
 
-  groupVehiclesByLine(vehicles) {
-    return vehicles?.reduce((groups, vehicle) => {
+  // Group vehicles by line, each group's arrivals sorted soonest first
+  groupVehiclesByLine(vehicles, elapsed = 0) {
+    const groups = vehicles?.reduce((groups, vehicle) => {
+      const seconds = vehicle.secondsLeft - elapsed;
+      if (seconds <= 0) return groups; // already departed since the fetch
       const key = vehicle.lineNumber;
       if (!groups[key]) {
         groups[key] = {
@@ -440,11 +549,13 @@ export class TransportCard extends LitElement {
         };
       }
       groups[key].arrivals.push({
-        seconds: vehicle.secondsLeft,
+        seconds,
         stations: vehicle.stationsBetween
       });
       return groups;
     }, {}) ?? {};
+    Object.values(groups).forEach(group => group.arrivals.sort((a, b) => a.seconds - b.seconds));
+    return groups;
   }
 
   renderArrivalTimes(arrivals) {
@@ -497,8 +608,16 @@ export class TransportCard extends LitElement {
     `;
   }
 
-  renderStop(stop) {
-    const groups = this.groupVehiclesByLine(stop.vehicles);
+  renderStop({ stop, groups: allGroups }, elapsed = 0) {
+    // Arrival times were grouped at fetch time: age them and drop the departed
+    const groups = allGroups
+      .map(group => ({
+        ...group,
+        arrivals: group.arrivals
+          .filter(arrival => arrival.seconds - elapsed > 0)
+          .map(arrival => ({ ...arrival, seconds: arrival.seconds - elapsed }))
+      }))
+      .filter(group => group.arrivals.length > 0);
     const hasData = stop.vehicles && stop.vehicles.length > 0;
     const statusClass = hasData ? 'online' : 'unknown';
 
@@ -514,7 +633,7 @@ export class TransportCard extends LitElement {
           <div class="distance">📍 ${Math.round(stop.distance)}m</div>
         ` : ''}
         <div class="transport-groups">
-          ${Object.values(groups).length > 0 ? Object.values(groups).map(group => html`
+          ${groups.length > 0 ? groups.map(group => html`
             <div class="transport-group">
               <div class="group-header">
                 <span class="line-number">${group.lineNumber}</span>
@@ -522,7 +641,6 @@ export class TransportCard extends LitElement {
               </div>
               <div class="arrivals-list">
                 ${group.arrivals
-                  .sort((a, b) => a.seconds - b.seconds)
                   .slice(0, this._expanded ? 5 : 3)
                   .map(({ seconds, stations }) => {
                     const minutes = Math.ceil(seconds / 60);
@@ -579,19 +697,10 @@ export class TransportCard extends LitElement {
     }
 
     const attr = entityState.attributes || {};
-    const allStops = attr.stations || [];
+    const allStops = this._stations ?? attr.stations ?? [];
     const isLoading = entityState.state === 'unavailable' || entityState.state === 'unknown';
     const hasNoStations = allStops.length === 0;
-    
-    // Debug info
-    console.log('Transport card render debug:', {
-      entityState: entityState.state,
-      isLoading,
-      hasNoStations,
-      stationsCount: allStops.length,
-      attributes: Object.keys(attr)
-    });
-    
+
     if (isLoading) {
       return html`
         <ha-card>
@@ -625,18 +734,9 @@ export class TransportCard extends LitElement {
       `;
     }
 
-    // Filter stations based on selected_stations config
-    let filteredStops = allStops;
-    if (this._config.selected_stations && this._config.selected_stations.length > 0) {
-      filteredStops = allStops.filter(station => 
-        this._config.selected_stations.includes(station.stopId?.toString()) ||
-        this._config.selected_stations.includes(station.stopId)
-      );
-    }
-    
-    // Apply limit
-    const displayStops = filteredStops.slice(0, this._config.max_stations);
-    const nextDeparture = this.getNextDeparture(filteredStops);
+    const { displayStops, departures } = this._viewModel(allStops);
+    const elapsed = this._elapsedSeconds();
+    const nextDeparture = this.getNextDeparture(departures, elapsed);
     
     const cardClass = this._config.compact_view || !this._expanded ? 'compact' : '';
 
@@ -655,7 +755,7 @@ export class TransportCard extends LitElement {
           
           ${displayStops.length > 0 ? html`
             <div class="stop-list">
-              ${displayStops.map(stop => this.renderStop(stop))}
+              ${displayStops.map(stop => this.renderStop(stop, elapsed))}
             </div>
           ` : html`
             <div class="no-data">
@@ -699,7 +799,9 @@ class TransportCardEditor extends LitElement {
       _config: { state: true },
       _entities: { state: true },
       _availableStations: { state: true },
-      _dropdownOpen: { state: true }
+      _dropdownOpen: { state: true },
+      _fetchedStations: { state: true },
+      _stationQuery: { state: true }
     };
   }
 
@@ -708,6 +810,14 @@ class TransportCardEditor extends LitElement {
     this._entities = [];
     this._availableStations = [];
     this._dropdownOpen = false;
+    this._fetchedStations = null;
+    this._fetchedEntity = null;
+    this._stationQuery = '';
+    this._entitiesSource = undefined;
+    this._stationsSource = null;
+    this._stationsSignature = null;
+    this._catalogue = new Map();
+    this._matches = null;
   }
 
   static styles = css`
@@ -870,6 +980,11 @@ class TransportCardEditor extends LitElement {
       background: var(--secondary-background-color);
     }
 
+    .station-search {
+      display: block;
+      padding: 4px 12px;
+    }
+
     .dropdown-divider {
       height: 1px;
       background: var(--divider-color);
@@ -898,56 +1013,106 @@ class TransportCardEditor extends LitElement {
 
   updated(changedProperties) {
     if (changedProperties.has('hass') && this.hass) {
-      this._entities = Object.keys(this.hass.states)
-        .filter(entityId => entityId.startsWith('sensor.'))
-        .sort();
-      
-      // Update available stations when entity changes
+      this._updateEntities();
       this._updateAvailableStations();
     }
     
     if (changedProperties.has('_config') && this._config?.entity) {
+      this._fetchStations();
+      this._updateAvailableStations();
+    }
+
+    if (changedProperties.has('_fetchedStations')) {
       this._updateAvailableStations();
     }
   }
 
+  // Load the station list over the websocket API when it is not an attribute
+  async _fetchStations() {
+    const entity = this._config?.entity;
+    if (!this.hass || !entity || this._fetchedEntity === entity) return;
+
+    this._fetchedEntity = entity;
+    this._fetchedStations = null;
+    try {
+      const result = await this.hass.callWS({
+        type: 'serbian_transport/stations',
+        entity_id: entity
+      });
+      if (this._fetchedEntity === entity) {
+        this._fetchedStations = result.stations;
+      }
+    } catch (err) {
+      // Older integration or a YAML sensor: only the stations attribute is available
+    }
+  }
+
+  // The entity list follows the entity registry, not every state change
+  _updateEntities() {
+    const source = this.hass.entities ?? null;
+    if (source === this._entitiesSource && (source !== null || this._entities.length > 0)) return;
+    this._entitiesSource = source;
+    this._entities = Object.keys(this.hass.states)
+      .filter(entityId => entityId.startsWith('sensor.'))
+      .sort();
+  }
+
+  // Rebuild the station catalogue only when the set of stations changes
   _updateAvailableStations() {
-    console.log('Updating available stations...', {
-      hasHass: !!this.hass,
-      hasEntity: !!this._config?.entity,
-      entity: this._config?.entity
+    const entityState = this.hass && this._config?.entity
+      ? this.hass.states[this._config.entity]
+      : null;
+    const stations = entityState?.attributes?.stations ?? this._fetchedStations ?? null;
+    if (stations === this._stationsSource) return;
+    this._stationsSource = stations;
+
+    const signature = stations
+      ? stations.map(station => `${station.stopId}:${station.name}:${Math.round(station.distance || 0)}`).join('|')
+      : null;
+    if (signature === this._stationsSignature) return;
+    this._stationsSignature = signature;
+
+    const catalogue = new Map();
+    (stations || []).forEach(station => {
+      const id = station.stopId?.toString() || station.stopId;
+      const name = station.name || `Station ${station.stopId}`;
+      catalogue.set(id, {
+        id,
+        name,
+        distance: station.distance ? Math.round(station.distance) : null,
+        search: `${name} ${id}`.toLowerCase()
+      });
+    });
+    this._catalogue = catalogue;
+    this._availableStations = Array.from(catalogue.values()).sort((a, b) => {
+      // Sort by distance if available, otherwise by name
+      if (a.distance !== null && b.distance !== null) {
+        return a.distance - b.distance;
+      }
+      return a.name.localeCompare(b.name);
     });
+    this._matches = null;
+  }
 
-    if (!this.hass || !this._config?.entity) {
-      this._availableStations = [];
-      console.log('No hass or entity, clearing stations');
-      return;
-    }
+  // Stations matching the search box; an exact stop number comes first
+  _matchingStations() {
+    const query = this._stationQuery.trim().toLowerCase();
+    if (this._matches && this._matches.query === query
+        && this._matches.stations === this._availableStations) {
+      return this._matches.result;
+    }
+    let result = this._availableStations;
+    if (query) {
+      const exact = this._catalogue.get(query);
+      result = result.filter(station => station !== exact && station.search.includes(query));
+      if (exact) result = [exact, ...result];
+    }
+    this._matches = { query, stations: this._availableStations, result };
+    return result;
+  }
 
-    const entityState = this.hass.states[this._config.entity];
-    console.log('Entity state:', entityState);
-    
-    if (entityState?.attributes?.stations) {
-      const stations = entityState.attributes.stations;
-      console.log('Found stations:', stations.length, stations);
-      
-      this._availableStations = stations.map(station => ({
-        id: station.stopId?.toString() || station.stopId,
-        name: station.name || `Station ${station.stopId}`,
-        distance: station.distance ? Math.round(station.distance) : null
-      })).sort((a, b) => {
-        // Sort by distance if available, otherwise by name
-        if (a.distance !== null && b.distance !== null) {
-          return a.distance - b.distance;
-        }
-        return a.name.localeCompare(b.name);
-      });
-      
-      console.log('Processed stations:', this._availableStations);
-    } else {
-      this._availableStations = [];
-      console.log('No stations in entity attributes');
-    }
+  _searchChanged(ev) {
+    this._stationQuery = ev.target.value || '';
   }
 
   _valueChanged(ev) {
@@ -1013,7 +1178,10 @@ class TransportCardEditor extends LitElement {
   }
 
   _refreshStations() {
-    console.log('Refreshing stations data...');
+    this._fetchedEntity = null;
+    this._stationsSource = null;
+    this._stationsSignature = null;
+    this._fetchStations();
     this._updateAvailableStations();
     this.requestUpdate();
   }
@@ -1042,10 +1210,7 @@ class TransportCardEditor extends LitElement {
       return html`<div>Loading...</div>`;
     }
 
-    // Ensure stations are updated on render
-    if (this._config.entity && this._availableStations.length === 0) {
-      setTimeout(() => this._updateAvailableStations(), 100);
-    }
+    const selected = new Set(this._config.selected_stations || []);
 
     return html`
       <div class="card-config">
@@ -1121,26 +1286,32 @@ class TransportCardEditor extends LitElement {
               <div class="station-dropdown-container">
                 <div class="dropdown-header" @click=${this._toggleDropdown}>
                   <span class="dropdown-text">
-                    ${(this._config.selected_stations || []).length === 0 
-                      ? 'All stations (click to select specific)' 
-                      : `${(this._config.selected_stations || []).length} station(s) selected`}
+                    ${selected.size === 0
+                      ? 'All stations (click to select specific)'
+                      : `${selected.size} station(s) selected`}
                   </span>
                   <ha-icon icon="mdi:chevron-down" class="dropdown-icon ${this._dropdownOpen ? 'open' : ''}"></ha-icon>
                 </div>
                 
                 <div class="dropdown-content ${this._dropdownOpen ? 'open' : ''}">
+                  <ha-textfield
+                    class="station-search"
+                    placeholder="Search by name or stop number"
+                    .value=${this._stationQuery}
+                    @input=${this._searchChanged}
+                  ></ha-textfield>
                   <div class="dropdown-item" @click=${this._selectAllStations}>
-                    <ha-checkbox 
-                      .checked=${(this._config.selected_stations || []).length === 0}
-                      .indeterminate=${(this._config.selected_stations || []).length > 0 && (this._config.selected_stations || []).length < this._availableStations.length}
+                    <ha-checkbox
+                      .checked=${selected.size === 0}
+                      .indeterminate=${selected.size > 0 && selected.size < this._availableStations.length}
                     ></ha-checkbox>
                     <span>All stations</span>
                   </div>
                   <div class="dropdown-divider"></div>
-                  ${this._availableStations.map(station => html`
+                  ${this._matchingStations().map(station => html`
                     <div class="dropdown-item" @click=${() => this._toggleStationById(station.id)}>
                       <ha-checkbox
-                        .checked=${(this._config.selected_stations || []).includes(station.id)}
+                        .checked=${selected.has(station.id)}
                       ></ha-checkbox>
                       <span class="station-info">
                         <span class="station-name">${station.name}</span>
@@ -1194,15 +1365,19 @@ class TransportCardEditor extends LitElement {
   }
 }
 
-customElements.define('transport-card', TransportCard);
-customElements.define('transport-card-editor', TransportCardEditor);
-
-// Register the card info for Home Assistant UI
-window.customCards = window.customCards || [];
-window.customCards.push({
-  type: 'transport-card',
-  name: 'Serbian Transport Card',
-  description: 'Display Serbian public transport information with real-time arrivals',
-  preview: false,
-  documentationURL: 'https://github.com/dzarlax/HASS-Serbian-transport',
-});
\ No newline at end of file
+// The card may be loaded twice: from its versioned URL and from a manually
+// added dashboard resource pointing at the fixed URL
+if (!customElements.get('transport-card')) {
+  customElements.define('transport-card', TransportCard);
+  customElements.define('transport-card-editor', TransportCardEditor);
+
+  // Register the card info for Home Assistant UI
+  window.customCards = window.customCards || [];
+  window.customCards.push({
+    type: 'transport-card',
+    name: 'Serbian Transport Card',
+    description: 'Display Serbian public transport information with real-time arrivals',
+    preview: false,
+    documentationURL: 'https://github.com/dzarlax/HASS-Serbian-transport',
+  });
+}
\ No newline at end of file
@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Benchmark the coordinator and sensor hot paths of the Serbian Transport integration.
+
+Runs the pytest-benchmark suite in tests/test_benchmark.py: synthetic
+payloads of 10, 100 and 1000 stations served by a local stub server, fetched,
+published to a coordinator and turned into sensor state and attributes, with
+memory and attribute size checks. Needs the packages in requirements_test.txt:
+
+    python3 scripts/benchmark.py
+    python3 scripts/benchmark.py --rounds 100
+    python3 scripts/benchmark.py --save baseline
+    python3 scripts/benchmark.py --compare baseline --threshold 1.25
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def main():
+    """Main CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark Serbian Transport hot paths')
+    parser.add_argument('--rounds', type=int, default=50,
+                       help='Minimum timed calls per case')
+    parser.add_argument('--save', metavar='NAME',
+                       help='Save the results under this name, e.g. a baseline')
+    parser.add_argument('--compare', metavar='NAME',
+                       help='Fail if a case regressed against this saved run')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                       help='Allowed ratio of the median to the baseline before failing')
+
+    args = parser.parse_args()
+
+    command = [
+        sys.executable, "-m", "pytest", "tests/test_benchmark.py",
+        "--benchmark-only",
+        f"--benchmark-min-rounds={args.rounds}",
+        "--benchmark-columns=median,iqr,max,rounds",
+    ]
+    if args.save:
+        command.append(f"--benchmark-save={args.save}")
+    if args.compare:
+        percent = round((args.threshold - 1) * 100)
+        command += [
+            f"--benchmark-compare={args.compare}",
+            f"--benchmark-compare-fail=median:{percent}%",
+        ]
+    sys.exit(subprocess.call(command, cwd=ROOT))
+
+
+if __name__ == "__main__":
+    main()
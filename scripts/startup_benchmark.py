@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Benchmark how long the Serbian Transport integration takes to import and set up.
+
+Import time is measured in fresh interpreters that have already imported what
+Home Assistant has loaded by the time it imports the integration, so only the
+integration's own cost is counted. Setup time covers the steps async_setup
+and async_setup_entry wait for: loading the card, and a coordinator's first
+refresh from a local stub server or its load of the station cache. Forwarding
+the platforms and adding the entities are not measured.
+
+Needs a development environment with Home Assistant installed:
+
+    python3 scripts/startup_benchmark.py
+    python3 scripts/startup_benchmark.py --runs 20 --rounds 50
+    python3 scripts/startup_benchmark.py --save baseline.json
+    python3 scripts/startup_benchmark.py --compare baseline.json --threshold 1.25
+"""
+
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from aiohttp import ClientSession, web  # noqa: E402
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.helpers.json import json_bytes  # noqa: E402
+
+from custom_components.serbian_transport.api import TransportApiClient  # noqa: E402
+from custom_components.serbian_transport.cache import (  # noqa: E402
+    StationMetadataCache,
+    station_metadata,
+)
+from custom_components.serbian_transport.const import DATA_CLIENT, DATA_COALESCER  # noqa: E402
+from custom_components.serbian_transport.coordinator import (  # noqa: E402
+    TransportStationsCoordinator,
+)
+from custom_components.serbian_transport.frontend import CardAsset  # noqa: E402
+from tests.payloads import LAT, LON, make_payload  # noqa: E402
+
+PACKAGE = "custom_components.serbian_transport"
+# Modules of the integration, in the order Home Assistant imports them
+MODULES = [PACKAGE, f"{PACKAGE}.config_flow", f"{PACKAGE}.sensor", f"{PACKAGE}.diagnostics"]
+# Loaded by Home Assistant before any custom integration
+PRELOADED = [
+    "aiohttp",
+    "voluptuous",
+    "homeassistant.core",
+    "homeassistant.config_entries",
+    "homeassistant.helpers.config_validation",
+    "homeassistant.helpers.update_coordinator",
+    "homeassistant.helpers.entity_platform",
+    "homeassistant.components.sensor",
+]
+
+RADIUS = 3000
+
+IMPORT_PROBE = """
+import importlib, json, sys, time
+for name in {preloaded!r}:
+    importlib.import_module(name)
+before = set(sys.modules)
+started = time.perf_counter()
+importlib.import_module({module!r})
+elapsed = (time.perf_counter() - started) * 1000
+print(json.dumps({{"ms": elapsed, "modules": len(set(sys.modules) - before)}}))
+"""
+
+
+async def start_stub(payloads: Dict[int, bytes]) -> web.AppRunner:
+    """Serve each payload under a /<size> prefix on localhost."""
+
+    async def stations(request: web.Request) -> web.Response:
+        body = payloads[int(request.match_info["size"])]
+        return web.Response(body=body, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/{size}/api/stations/{city}/all", stations)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    return runner
+
+
+def stub_url(runner: web.AppRunner) -> str:
+    host, port = runner.addresses[0][:2]
+    return f"http://{host}:{port}"
+
+
+async def measure(func: Callable[[], Any], rounds: int) -> Dict[str, float]:
+    """Time ``rounds`` calls of ``func`` (awaited if it returns a coroutine)."""
+
+    async def call() -> Any:
+        result = func()
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+    await call()  # warm up
+    timings = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    await call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "median_ms": round(statistics.median(timings), 4),
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def measure_import(module: str, runs: int) -> Dict[str, float]:
+    """Import ``module`` in ``runs`` fresh interpreters and return the median cost."""
+    timings = []
+    modules = 0
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE.format(preloaded=PRELOADED, module=module)],
+            cwd=ROOT,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout
+        probe = json.loads(output)
+        timings.append(probe["ms"])
+        modules = probe["modules"]
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "modules": modules,
+    }
+
+
+async def run_setup(stations: int, vehicles: int, rounds: int) -> Dict[str, Dict[str, float]]:
+    """Time the setup steps that Home Assistant waits for."""
+    results: Dict[str, Dict[str, float]] = {}
+    results["async_setup.card_load"] = await measure(CardAsset.load, rounds)
+    card = CardAsset.load()
+    results["card_compress (background)"] = await measure(card.compress, rounds)
+
+    runner = await start_stub({stations: json_bytes(make_payload(stations, vehicles))})
+    hass = HomeAssistant(tempfile.mkdtemp())
+    try:
+        async with ClientSession() as session:
+            hass.data[DATA_CLIENT] = TransportApiClient(
+                session, f"{stub_url(runner)}/{stations}"
+            )
+            cache = StationMetadataCache(hass, "bench")
+
+            async def first_refresh() -> None:
+                # Fresh coalescer, so no response is shared between rounds
+                hass.data.pop(DATA_COALESCER, None)
+                coordinator = TransportStationsCoordinator(hass, LAT, LON, RADIUS)
+                await coordinator.async_refresh()
+                await coordinator.async_shutdown()
+
+            async def load_cache() -> None:
+                coordinator = TransportStationsCoordinator(hass, LAT, LON, RADIUS, cache=cache)
+                await coordinator.async_load_cache()
+                await coordinator.async_shutdown()
+
+            results[f"coordinator.first_refresh[{stations}]"] = await measure(
+                first_refresh, rounds
+            )
+
+            coordinator = TransportStationsCoordinator(hass, LAT, LON, RADIUS)
+            await coordinator.async_refresh()
+            await cache._store.async_save({
+                "saved_at": time.time(),
+                "stations": [station_metadata(station).as_dict() for station in coordinator.data],
+            })
+            await coordinator.async_shutdown()
+            results[f"coordinator.load_cache[{stations}]"] = await measure(load_cache, rounds)
+    finally:
+        await runner.cleanup()
+        await hass.async_stop(force=True)
+    return results
+
+
+def print_results(results: Dict[str, Dict[str, float]]) -> None:
+    columns = ["median_ms", "peak_kib", "modules"]
+    width = max(len(name) for name in results)
+    print(f"{'case':<{width}}  " + "  ".join(f"{column:>10}" for column in columns))
+    for name, values in results.items():
+        cells = [
+            f"{values[column]:>10}" if column in values else f"{'-':>10}" for column in columns
+        ]
+        print(f"{name:<{width}}  " + "  ".join(cells))
+
+
+def compare(results: Dict[str, Dict[str, float]], baseline_path: str, threshold: float) -> int:
+    """Print cases slower, heavier or importing more than the baseline; return their count."""
+    with open(baseline_path, 'r') as f:
+        baseline = json.load(f)
+    regressions = 0
+    for name, values in results.items():
+        for metric in ("median_ms", "peak_kib", "modules"):
+            before = baseline.get(name, {}).get(metric)
+            after = values.get(metric)
+            if before and after is not None and after > before * threshold:
+                print(f"REGRESSION {name} {metric}: {before} -> {after}")
+                regressions += 1
+    return regressions
+
+
+def main():
+    """Main CLI interface"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Benchmark Serbian Transport import and setup time')
+    parser.add_argument('--runs', type=int, default=10,
+                       help='Fresh interpreters per imported module')
+    parser.add_argument('--rounds', type=int, default=20,
+                       help='Timed calls per setup case')
+    parser.add_argument('--stations', type=int, default=100,
+                       help='Stations in the first fetch and the cache')
+    parser.add_argument('--vehicles', type=int, default=12,
+                       help='Vehicles per station')
+    parser.add_argument('--save', metavar='FILE',
+                       help='Write the results as JSON, e.g. a baseline')
+    parser.add_argument('--compare', metavar='FILE',
+                       help='Fail if a case regressed against this baseline')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                       help='Allowed ratio to the baseline before failing')
+
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, float]] = {
+        f"import {module}": measure_import(module, args.runs) for module in MODULES
+    }
+    results.update(asyncio.run(run_setup(args.stations, args.vehicles, args.rounds)))
+    print_results(results)
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(results, f, indent=2)
+        print(f"Results saved to {args.save}")
+
+    if args.compare and compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Fixtures for the Serbian Transport tests.
+
+The tests run the integration against a real Home Assistant core and local
+aiohttp stub servers standing in for the transport API. Dependencies are
+listed in requirements_test.txt.
+"""
+import asyncio
+from pathlib import Path
+import sys
+from typing import Any, Callable, Iterator, List
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def loop() -> Iterator[asyncio.AbstractEventLoop]:
+    """Return an event loop shared by a test and its fixtures."""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+@pytest.fixture
+def hass(loop: asyncio.AbstractEventLoop, tmp_path: Path) -> Iterator[Any]:
+    """Return a bare Home Assistant instance running on ``loop``."""
+    from homeassistant.core import HomeAssistant
+
+    async def create() -> HomeAssistant:
+        return HomeAssistant(str(tmp_path))
+
+    hass = loop.run_until_complete(create())
+    yield hass
+    loop.run_until_complete(hass.async_stop(force=True))
+
+
+@pytest.fixture
+def session(loop: asyncio.AbstractEventLoop) -> Iterator[Any]:
+    """Return an aiohttp client session for the stub servers."""
+    from aiohttp import ClientSession
+
+    async def create() -> ClientSession:
+        return ClientSession()
+
+    session = loop.run_until_complete(create())
+    yield session
+    loop.run_until_complete(session.close())
+
+
+@pytest.fixture
+def stub_server(loop: asyncio.AbstractEventLoop) -> Iterator[Callable[[Any], str]]:
+    """Return a function serving an aiohttp application on localhost, returning its URL."""
+    from aiohttp import web
+
+    runners: List[web.AppRunner] = []
+
+    async def start(app: web.Application) -> str:
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        await web.TCPSite(runner, "127.0.0.1", 0).start()
+        runners.append(runner)
+        host, port = runner.addresses[0][:2]
+        return f"http://{host}:{port}"
+
+    yield lambda app: loop.run_until_complete(start(app))
+    for runner in runners:
+        loop.run_until_complete(runner.cleanup())
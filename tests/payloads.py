@@ -0,0 +1,32 @@
+"""Synthetic station payloads shared by the benchmarks.
+
+Imported by tests/test_benchmark.py and scripts/startup_benchmark.py, so both
+measure the same data.
+"""
+import random
+from typing import Any, Dict, List
+
+# Central Belgrade: only the bg backend is in range
+LAT, LON = 44.8125, 20.4612
+
+
+def make_payload(stations: int, vehicles: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Return a stations payload in the API's shape around LAT/LON, stable for a given seed."""
+    rng = random.Random(seed)
+    return [
+        {
+            "stopId": 1000 + index,
+            "name": f"Station {index}",
+            "coords": [LAT + rng.uniform(-0.02, 0.02), LON + rng.uniform(-0.02, 0.02)],
+            "vehicles": [
+                {
+                    "lineNumber": str(rng.randint(1, 99)),
+                    "lineName": f"Destination {rng.randint(1, 50)}",
+                    "secondsLeft": rng.randint(30, 3600),
+                    "stationsBetween": rng.randint(0, 15),
+                }
+                for _ in range(vehicles)
+            ],
+        }
+        for index in range(stations)
+    ]
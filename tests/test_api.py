@@ -0,0 +1,52 @@
+"""Tests of the API client against a local stub server."""
+from typing import List, Optional
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import web  # noqa: E402
+
+from custom_components.serbian_transport.api import TransportApiClient  # noqa: E402
+from custom_components.serbian_transport.const import VALIDATED_CACHE_SIZE  # noqa: E402
+
+# Central Belgrade
+LAT, LON = 44.8125, 20.4612
+
+
+class EtagStub:
+    """Stations endpoint tagging every response and answering revalidations with 304."""
+
+    def __init__(self) -> None:
+        self.if_none_match: List[Optional[str]] = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/api/stations/{city}/all", self._stations)
+        return app
+
+    async def _stations(self, request: web.Request) -> web.Response:
+        etag = f'"{request.query["rad"]}"'
+        self.if_none_match.append(request.headers.get("If-None-Match"))
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304)
+        return web.json_response([], headers={"ETag": etag})
+
+
+def test_revalidation_cache_is_bounded(loop, session, stub_server) -> None:
+    """Queries beyond the cache size evict the least recently used ones."""
+    stub = EtagStub()
+    client = TransportApiClient(session, stub_server(stub.app()))
+    radii = list(range(100, 100 * (VALIDATED_CACHE_SIZE + 3), 100))
+
+    async def scenario() -> None:
+        for rad in radii:
+            await client.async_get_stations("bg", LAT, LON, rad)
+        # The newest query is revalidated, the oldest downloaded again
+        stub.if_none_match.clear()
+        await client.async_get_stations("bg", LAT, LON, radii[-1])
+        await client.async_get_stations("bg", LAT, LON, radii[0])
+
+    loop.run_until_complete(scenario())
+    assert stub.if_none_match == [f'"{radii[-1]}"', None]
+    assert [len(queries) for queries in client._validated.values()] == [VALIDATED_CACHE_SIZE]
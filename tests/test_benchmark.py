@@ -0,0 +1,150 @@
+"""Benchmarks of the fetch, publish and sensor hot paths.
+
+Synthetic payloads of 10, 100 and 1000 stations are served by a local stub
+server. Besides the timings collected by pytest-benchmark, each case checks
+the peak memory it allocates and the size of the attributes it writes:
+
+    pytest tests/test_benchmark.py --benchmark-only
+    pytest tests/test_benchmark.py --benchmark-autosave
+    pytest tests/test_benchmark.py --benchmark-compare --benchmark-compare-fail=median:25%
+"""
+import tracemalloc
+from typing import Any, Callable
+
+import pytest
+
+pytest.importorskip("homeassistant")
+pytest.importorskip("pytest_benchmark")
+
+from aiohttp import web  # noqa: E402
+
+from homeassistant.helpers.json import json_bytes  # noqa: E402
+
+from custom_components.serbian_transport.api import TransportApiClient  # noqa: E402
+from custom_components.serbian_transport.const import ATTR_STATIONS  # noqa: E402
+from custom_components.serbian_transport.coordinator import (  # noqa: E402
+    TransportStationsCoordinator,
+    fetch_stations,
+)
+from custom_components.serbian_transport.sensor import (  # noqa: E402
+    TransportNextDepartureSensor,
+    TransportStationsCountSensor,
+)
+from tests.payloads import LAT, LON, make_payload  # noqa: E402
+
+RADIUS = 3000
+
+SIZES = [10, 100, 1000]
+VEHICLES = 12
+
+# Peak memory of a fetch, in multiples of the payload it decodes
+MAX_FETCH_PEAK_RATIO = 20
+# Attributes the recorder stores must not grow with the number of stations
+MAX_RECORDED_ATTRIBUTES_BYTES = 8 * 1024
+
+
+def peak_bytes(func: Callable[[], Any]) -> int:
+    """Return the peak memory traced while calling ``func``."""
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@pytest.fixture(params=SIZES, ids=lambda size: f"{size}_stations")
+def size(request) -> int:
+    """Return the number of stations in the payload."""
+    return request.param
+
+
+@pytest.fixture
+def payload(size: int) -> bytes:
+    """Return the serialized stations payload."""
+    return json_bytes(make_payload(size, VEHICLES, seed=size))
+
+
+@pytest.fixture
+def client(session, stub_server, payload: bytes) -> TransportApiClient:
+    """Return an API client querying a stub server that serves ``payload``."""
+
+    async def stations(request: web.Request) -> web.Response:
+        return web.Response(body=payload, content_type="application/json")
+
+    app = web.Application()
+    app.router.add_get("/api/stations/{city}/all", stations)
+    return TransportApiClient(session, stub_server(app))
+
+
+@pytest.fixture
+def stations(loop, client: TransportApiClient) -> list:
+    """Return the stations fetched from the stub server."""
+    stations, _ = loop.run_until_complete(fetch_stations(client, LAT, LON, RADIUS))
+    return stations
+
+
+@pytest.fixture
+def coordinator(loop, hass, stations: list):
+    """Return a coordinator publishing ``stations``."""
+
+    async def create() -> TransportStationsCoordinator:
+        return TransportStationsCoordinator(hass, LAT, LON, RADIUS)
+
+    coordinator = loop.run_until_complete(create())
+    coordinator.data = coordinator._accept(stations, RADIUS)
+    yield coordinator
+    loop.run_until_complete(coordinator.async_shutdown())
+
+
+def test_fetch_stations(benchmark, loop, client, payload: bytes, size: int) -> None:
+    """Fetch, decode and validate a payload."""
+
+    def fetch() -> list:
+        stations, _ = loop.run_until_complete(fetch_stations(client, LAT, LON, RADIUS))
+        return stations
+
+    assert len(benchmark(fetch)) == size
+    peak = peak_bytes(fetch)
+    benchmark.extra_info["payload_kib"] = round(len(payload) / 1024, 1)
+    benchmark.extra_info["peak_kib"] = round(peak / 1024, 1)
+    assert peak <= MAX_FETCH_PEAK_RATIO * len(payload)
+
+
+def test_publish(benchmark, coordinator, stations: list) -> None:
+    """Filter, sort and index a payload in the coordinator."""
+    published = benchmark(coordinator._accept, stations, RADIUS)
+    assert published
+    benchmark.extra_info["peak_kib"] = round(
+        peak_bytes(lambda: coordinator._accept(stations, RADIUS)) / 1024, 1
+    )
+
+
+def test_next_departure_state(benchmark, coordinator) -> None:
+    """Compute the next departure sensor's state."""
+    sensor = TransportNextDepartureSensor(coordinator, "bench", "Bench")
+    assert benchmark(lambda: sensor.native_value) is not None
+
+
+def test_next_departure_attributes(benchmark, coordinator) -> None:
+    """Build the next departure sensor's attributes, bounded whatever the station count."""
+    sensor = TransportNextDepartureSensor(coordinator, "bench", "Bench")
+    attributes = benchmark(lambda: sensor.extra_state_attributes)
+    serialized = len(json_bytes(attributes))
+    benchmark.extra_info["serialized_kib"] = round(serialized / 1024, 2)
+    assert serialized <= MAX_RECORDED_ATTRIBUTES_BYTES
+
+
+@pytest.mark.parametrize("expose_stations", [True, False], ids=["stations", "summary"])
+def test_stations_count_attributes(benchmark, coordinator, expose_stations: bool) -> None:
+    """Build the stations count attributes; the full list never reaches the recorder."""
+    sensor = TransportStationsCountSensor(coordinator, "bench", "Bench", expose_stations)
+    attributes = benchmark(lambda: sensor.extra_state_attributes)
+    benchmark.extra_info["serialized_kib"] = round(len(json_bytes(attributes)) / 1024, 2)
+    recorded = {
+        key: value
+        for key, value in attributes.items()
+        if key not in sensor._unrecorded_attributes
+    }
+    assert (ATTR_STATIONS in attributes) is expose_stations
+    assert len(json_bytes(recorded)) <= MAX_RECORDED_ATTRIBUTES_BYTES
@@ -0,0 +1,53 @@
+"""Tests of the request coalescer shared by every location."""
+from typing import List
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from custom_components.serbian_transport.coalescer import StationRequestCoalescer  # noqa: E402
+from custom_components.serbian_transport.models import Station, Vehicle  # noqa: E402
+
+# Central Belgrade
+LAT, LON = 44.8125, 20.4612
+RADIUS = 1000
+
+
+class FakeClient:
+    """API client returning one station, counting its calls."""
+
+    def __init__(self, *seconds_left: int) -> None:
+        self.calls = 0
+        self.station = Station(
+            stop_id=1,
+            name="Station 1",
+            city="bg",
+            lat=LAT,
+            lon=LON,
+            vehicles=tuple(
+                Vehicle(str(index), "Dorćol", seconds, 0)
+                for index, seconds in enumerate(seconds_left)
+            ),
+        )
+
+    async def async_get_stations(
+        self, city: str, lat: float, lon: float, rad: int
+    ) -> List[Station]:
+        self.calls += 1
+        return [self.station]
+
+
+def test_aged_result_drops_arrived_vehicles(loop) -> None:
+    """A cached payload older than the soonest arrival never serves negative ETAs."""
+    client = FakeClient(60, 90, 300)
+    coalescer = StationRequestCoalescer(client, max_age=600)
+
+    async def scenario() -> List[Station]:
+        await coalescer.async_get_stations("bg", LAT, LON, RADIUS)
+        # Served 90 s later, past the first vehicle's arrival
+        coalescer._cache["bg"][0].fetched_at -= 90
+        return await coalescer.async_get_stations("bg", LAT, LON, RADIUS)
+
+    stations = loop.run_until_complete(scenario())
+    assert client.calls == 1
+    assert [vehicle.seconds_left for vehicle in stations[0].vehicles] == [0, 210]
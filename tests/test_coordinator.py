@@ -0,0 +1,206 @@
+"""Tests of the coordinator's change detection, as seen by its sensors."""
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import web  # noqa: E402
+
+from custom_components.serbian_transport.api import TransportApiClient  # noqa: E402
+from custom_components.serbian_transport.coalescer import StationRequestCoalescer  # noqa: E402
+from custom_components.serbian_transport.const import (  # noqa: E402
+    DATA_CLIENT,
+    DATA_COALESCER,
+    FAST_UPDATE_INTERVAL,
+    IDLE_TIMEOUT,
+    MAX_UPDATE_INTERVAL,
+)
+from custom_components.serbian_transport.coordinator import (  # noqa: E402
+    TransportStationsCoordinator,
+)
+from custom_components.serbian_transport.sensor import (  # noqa: E402
+    TransportDiagnosticDescription,
+    TransportDiagnosticSensor,
+    TransportStationsCountSensor,
+)
+
+# Central Belgrade: only the bg backend is in range
+LAT, LON = 44.8125, 20.4612
+RADIUS = 1000
+# Between Belgrade and Novi Sad: both the bg and ns backends are in range
+BORDER_LAT, BORDER_LON = 45.07, 20.05
+BORDER_RADIUS = 10000
+
+
+def station(stop_id: int, seconds_left: int = 120, coords=(LAT, LON)) -> dict:
+    """Return a station in the API's shape, by default at the search center."""
+    return {
+        "stopId": stop_id,
+        "name": f"Station {stop_id}",
+        "coords": list(coords),
+        "vehicles": [
+            {"lineNumber": "26", "lineName": "Dorćol", "secondsLeft": seconds_left},
+        ],
+    }
+
+
+class RecordingCountSensor(TransportStationsCountSensor):
+    """Stations count sensor recording the attributes it writes."""
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.writes: List[Dict[str, Any]] = []
+
+    def async_write_ha_state(self) -> None:
+        self.writes.append(self.extra_state_attributes)
+
+
+class RecordingDiagnosticSensor(TransportDiagnosticSensor):
+    """Diagnostic sensor recording the values it writes."""
+
+    def __init__(self, *args: Any) -> None:
+        super().__init__(*args)
+        self.writes: List[Any] = []
+
+    def async_write_ha_state(self) -> None:
+        self.writes.append(self.native_value)
+
+
+class RecordingCache:
+    """Station cache recording the payloads it is asked to save."""
+
+    def __init__(self) -> None:
+        self.updates: List[list] = []
+
+    def async_update(self, stations: list) -> None:
+        self.updates.append(stations)
+
+
+REFRESHES = TransportDiagnosticDescription(
+    key="refreshes",
+    name="Refreshes",
+    value_fn=lambda coordinator, api: coordinator.stats.refreshes,
+)
+
+
+@pytest.fixture
+def coordinator(loop, hass, session, stub_server):
+    """Return a coordinator refreshed from a stub serving two stations."""
+
+    async def stations(request: web.Request) -> web.Response:
+        return web.json_response([station(1), station(2)])
+
+    app = web.Application()
+    app.router.add_get("/api/stations/{city}/all", stations)
+    url = stub_server(app)
+
+    async def create() -> TransportStationsCoordinator:
+        hass.data[DATA_CLIENT] = TransportApiClient(session, url)
+        coordinator = TransportStationsCoordinator(hass, LAT, LON, RADIUS)
+        await coordinator.async_refresh()
+        return coordinator
+
+    coordinator = loop.run_until_complete(create())
+    yield coordinator
+    loop.run_until_complete(coordinator.async_shutdown())
+
+
+@pytest.mark.parametrize("expose_stations", [True, False], ids=["stations", "summary"])
+def test_radius_change_rewrites_count_sensor(loop, coordinator, expose_stations: bool) -> None:
+    """A new radius reaches the sensor even when the stations inside stay the same."""
+    sensor = RecordingCountSensor(coordinator, "test", "Test", expose_stations)
+    remove = coordinator.async_add_listener(sensor._handle_coordinator_update)
+    sensor._handle_coordinator_update()
+    assert sensor.writes[-1]["search_radius"] == RADIUS
+    station_signature = coordinator.station_signature
+
+    loop.run_until_complete(coordinator.async_set_radius(RADIUS // 2))
+
+    assert coordinator.station_signature == station_signature
+    assert len(sensor.writes) == 2
+    assert sensor.writes[-1]["search_radius"] == RADIUS // 2
+    remove()
+
+
+def test_diagnostics_update_when_data_unchanged(loop, hass, coordinator) -> None:
+    """Diagnostic sensors follow every poll, even those the change check suppresses."""
+    api_stats = hass.data[DATA_CLIENT].stats
+    diagnostic = RecordingDiagnosticSensor(coordinator, "test", "Test", api_stats, REFRESHES)
+    count = RecordingCountSensor(coordinator, "test", "Test", False)
+    remove_diagnostic = diagnostic._async_add_listener()
+    remove_count = count._async_add_listener()
+    refreshes = coordinator.stats.refreshes
+
+    # The stub serves the same stations on every poll
+    for _ in range(2):
+        loop.run_until_complete(coordinator.async_refresh())
+
+    assert count.writes == []
+    assert diagnostic.writes == [refreshes + 1, refreshes + 2]
+    remove_diagnostic()
+    remove_count()
+
+
+def test_idle_throttle_is_opt_in(coordinator) -> None:
+    """Unwatched locations poll at the usual pace unless throttling is turned on."""
+    # Nobody has opened a card for longer than the idle timeout
+    coordinator._consumed_at = time.monotonic() - IDLE_TIMEOUT - 1
+    # The stub's vehicles are two minutes away
+    assert not coordinator.idle
+    assert coordinator._next_interval() == FAST_UPDATE_INTERVAL
+
+    coordinator.async_set_idle_throttle(True)
+    assert coordinator.idle
+    # Throttled, but a departure this close is never held to the idle ceiling
+    assert coordinator._next_interval() < MAX_UPDATE_INTERVAL
+    assert coordinator._next_interval() > FAST_UPDATE_INTERVAL
+
+    coordinator.async_set_idle_throttle(False)
+    assert coordinator._next_interval() == FAST_UPDATE_INTERVAL
+
+
+def test_partial_fetch_is_not_cached(loop, hass, session, stub_server) -> None:
+    """A city failing keeps its last known stations and the result out of the cache."""
+    failing = set()
+
+    async def stations(request: web.Request) -> web.Response:
+        if request.match_info["city"] in failing:
+            return web.Response(status=404)
+        return web.json_response([station(1, coords=(BORDER_LAT, BORDER_LON))])
+
+    app = web.Application()
+    app.router.add_get("/api/stations/{city}/all", stations)
+    url = stub_server(app)
+    cache = RecordingCache()
+
+    async def scenario() -> None:
+        client = hass.data[DATA_CLIENT] = TransportApiClient(session, url)
+        # No sharing window: every refresh reaches the stub
+        hass.data[DATA_COALESCER] = StationRequestCoalescer(client, max_age=0)
+        coordinator = TransportStationsCoordinator(
+            hass, BORDER_LAT, BORDER_LON, BORDER_RADIUS, cache=cache
+        )
+        await coordinator.async_refresh()
+        assert [item.key for item in coordinator.data] == ["bg:1", "ns:1"]
+        assert len(cache.updates) == 1
+
+        failing.add("ns")
+        await coordinator.async_refresh()
+        assert coordinator.last_update_success
+        current = {item.key: item for item in coordinator.data}
+        assert sorted(current) == ["bg:1", "ns:1"]
+        assert current["bg:1"].vehicles
+        assert current["ns:1"].vehicles == ()
+        assert len(cache.updates) == 1
+        # Not complete for any radius: a smaller one is fetched, not filtered
+        assert coordinator.fetch_rad == 0
+
+        failing.clear()
+        await coordinator.async_refresh()
+        assert len(cache.updates) == 2
+        assert coordinator.fetch_rad == BORDER_RADIUS
+        await coordinator.async_shutdown()
+
+    loop.run_until_complete(scenario())
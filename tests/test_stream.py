@@ -0,0 +1,273 @@
+"""Tests of the station stream against a local Server-Sent Events stub."""
+import asyncio
+import json
+from typing import Any, Callable, List, Optional, Union
+
+import pytest
+
+pytest.importorskip("homeassistant")
+
+from aiohttp import web  # noqa: E402
+
+from custom_components.serbian_transport.api import TransportApiClient  # noqa: E402
+from custom_components.serbian_transport.const import (  # noqa: E402
+    DATA_CLIENT,
+    MAX_UPDATE_INTERVAL,
+    STREAM_PATH,
+)
+from custom_components.serbian_transport.coordinator import (  # noqa: E402
+    TransportStationsCoordinator,
+)
+from custom_components.serbian_transport.stream import SseDecoder, StationStream  # noqa: E402
+
+# Central Belgrade: only the bg backend is in range
+LAT, LON = 44.8125, 20.4612
+RADIUS = 1000
+CIRCLE = (LAT, LON, RADIUS)
+
+
+def station(stop_id: int, seconds_left: int = 120) -> dict:
+    """Return a station in the API's shape with one vehicle."""
+    return {
+        "stopId": stop_id,
+        "name": f"Station {stop_id}",
+        "coords": [LAT, LON],
+        "vehicles": [
+            {"lineNumber": "26", "lineName": "Dorćol", "secondsLeft": seconds_left},
+        ],
+    }
+
+
+def event(type_: str, data: Any, id_: Optional[str] = None, retry: Optional[int] = None) -> bytes:
+    """Encode one event, its JSON spread over several data lines."""
+    lines = [f"event: {type_}"]
+    if id_ is not None:
+        lines.append(f"id: {id_}")
+    if retry is not None:
+        lines.append(f"retry: {retry}")
+    lines += [f"data: {line}" for line in json.dumps(data, indent=1).splitlines()]
+    return ("\n".join(lines) + "\n\n").encode()
+
+
+def split(payload: bytes, size: int) -> List[bytes]:
+    """Cut a body into chunks of ``size`` bytes, ignoring line and event boundaries."""
+    return [payload[start:start + size] for start in range(0, len(payload), size)]
+
+
+# Ends a connection script: keep the stream open with keepalives instead of closing
+KEEP_OPEN = object()
+
+Connection = Union[int, List[Any]]
+
+
+class StreamStub:
+    """Stream endpoint replaying one scripted response per connection.
+
+    A script is an HTTP status to fail with, or the chunks to send before
+    closing, optionally ending with KEEP_OPEN. Once the scripts are used up,
+    connections stay open without events.
+    """
+
+    def __init__(self, *connections: Connection) -> None:
+        self.connections = list(connections)
+        self.last_event_ids: List[Optional[str]] = []
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get(STREAM_PATH.format(city="{city}"), self._stream)
+        app.router.add_get("/api/stations/{city}/all", self._poll)
+        return app
+
+    async def _stream(self, request: web.Request) -> web.StreamResponse:
+        self.last_event_ids.append(request.headers.get("Last-Event-ID"))
+        script = self.connections.pop(0) if self.connections else [KEEP_OPEN]
+        if isinstance(script, int):
+            return web.Response(status=script)
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream"})
+        await response.prepare(request)
+        for chunk in script:
+            if chunk is KEEP_OPEN:
+                try:
+                    while True:
+                        await response.write(b": keepalive\n")
+                        await asyncio.sleep(0.05)
+                except ConnectionResetError:
+                    return response  # the client has gone
+            await response.write(chunk)
+            await asyncio.sleep(0.01)
+        return response
+
+    async def _poll(self, request: web.Request) -> web.Response:
+        return web.json_response([station(1), station(2)])
+
+
+async def wait_for(predicate: Callable[[], bool], timeout: float = 5) -> None:
+    """Wait until ``predicate`` holds."""
+    async with asyncio.timeout(timeout):
+        while not predicate():
+            await asyncio.sleep(0.01)
+
+
+def start_stream(hass, session, url: str, updates: List[int], drops: List[int]) -> StationStream:
+    stream = StationStream(
+        session,
+        "bg",
+        CIRCLE,
+        lambda: updates.append(1),
+        lambda: drops.append(1),
+        url,
+    )
+    stream.async_start(hass)
+    return stream
+
+
+def test_decoder_reassembles_split_events() -> None:
+    """Events cut at arbitrary byte offsets decode as if sent whole."""
+    body = (
+        b": comment\r\n"
+        + event("snapshot", [station(1)], id_="1", retry=2500)
+        + event("diff", {"changed": [], "removed": [1]}, id_="2")
+    )
+    for size in (1, 3, 7, len(body)):
+        decoder = SseDecoder()
+        events = [item for chunk in split(body, size) for item in decoder.feed(chunk)]
+        assert [(item.type, item.id) for item in events] == [("snapshot", "1"), ("diff", "2")]
+        assert events[0].retry == 2500
+        assert json.loads(events[0].data) == [station(1)]
+        assert json.loads(events[1].data) == {"changed": [], "removed": [1]}
+
+
+def test_snapshot_and_diffs(loop, hass, session, stub_server) -> None:
+    """A snapshot sets the stations, diffs change and remove them."""
+    body = (
+        event("snapshot", [station(1), station(2)], id_="1")
+        + event("diff", {"changed": [station(3, 60)], "removed": []}, id_="2")
+        + event("diff", {"changed": [station(1, 30)], "removed": [2]}, id_="3")
+    )
+    stub = StreamStub(split(body, 17) + [KEEP_OPEN])
+    url = stub_server(stub.app())
+    updates: List[int] = []
+    drops: List[int] = []
+
+    async def scenario() -> None:
+        stream = start_stream(hass, session, url, updates, drops)
+        await wait_for(lambda: len(updates) == 3)
+        assert stream.connected
+        current = {item.key: item for item in stream.current()}
+        assert sorted(current) == ["bg:1", "bg:3"]
+        assert current["bg:1"].vehicles[0].seconds_left <= 30
+        assert current["bg:3"].vehicles[0].seconds_left <= 60
+        stream.async_stop()
+
+    loop.run_until_complete(scenario())
+    assert drops == []
+
+
+def test_drop_reconnects_with_last_event_id(loop, hass, session, stub_server) -> None:
+    """A closed stream reports the drop and resumes from the last event."""
+    stub = StreamStub(
+        [event("snapshot", [station(1)], id_="7", retry=50)],
+        [event("snapshot", [station(2)], id_="8"), KEEP_OPEN],
+    )
+    url = stub_server(stub.app())
+    updates: List[int] = []
+    drops: List[int] = []
+
+    async def scenario() -> None:
+        stream = start_stream(hass, session, url, updates, drops)
+        await wait_for(lambda: len(updates) == 2)
+        assert len(drops) == 1
+        assert stream.connected
+        assert [item.key for item in stream.current()] == ["bg:2"]
+        assert stub.last_event_ids[:2] == [None, "7"]
+        stream.async_stop()
+
+    loop.run_until_complete(scenario())
+
+
+def test_unsupported_backend_stops_streaming(loop, hass, session, stub_server) -> None:
+    """A backend without a stream endpoint is left to polling."""
+    stub = StreamStub(404)
+    url = stub_server(stub.app())
+    updates: List[int] = []
+    drops: List[int] = []
+
+    async def scenario() -> None:
+        stream = start_stream(hass, session, url, updates, drops)
+        task = stream._task
+        await wait_for(task.done)
+        assert not stream.connected
+
+    loop.run_until_complete(scenario())
+    assert (updates, drops) == ([], [])
+    assert len(stub.last_event_ids) == 1
+
+
+def make_coordinator(loop, hass, session, url: str) -> TransportStationsCoordinator:
+    """Return a streaming coordinator whose API and stream point at ``url``."""
+
+    async def create() -> TransportStationsCoordinator:
+        hass.data[DATA_CLIENT] = TransportApiClient(session, url)
+        coordinator = TransportStationsCoordinator(hass, LAT, LON, RADIUS, streaming=True)
+        await coordinator.async_refresh()
+        return coordinator
+
+    return loop.run_until_complete(create())
+
+
+def test_coordinator_polls_after_drop(loop, hass, session, stub_server) -> None:
+    """A dropped stream makes the coordinator refresh and poll at the normal pace."""
+    stub = StreamStub([event("snapshot", [station(1)], retry=60000)])
+    url = stub_server(stub.app())
+    coordinator = make_coordinator(loop, hass, session, url)
+
+    async def scenario() -> None:
+        refreshes = coordinator.stats.refreshes
+        coordinator.async_start_stream()
+        await wait_for(
+            lambda: coordinator.stats.stream_updates
+            and coordinator.stats.refreshes > refreshes
+        )
+        assert not coordinator.stream_connected
+        assert coordinator.stats.stream_updates == 1
+        assert coordinator.update_interval.total_seconds() < MAX_UPDATE_INTERVAL
+        await coordinator.async_shutdown()
+
+    loop.run_until_complete(scenario())
+
+
+def test_coordinator_streams_until_stopped(loop, hass, session, stub_server) -> None:
+    """A connected stream replaces polling; stopping it restores the normal pace."""
+    stub = StreamStub([event("snapshot", [station(1), station(2)]), KEEP_OPEN])
+    url = stub_server(stub.app())
+    coordinator = make_coordinator(loop, hass, session, url)
+
+    async def scenario() -> None:
+        coordinator.async_start_stream()
+        await wait_for(lambda: coordinator.stream_connected)
+        assert coordinator.update_interval.total_seconds() == MAX_UPDATE_INTERVAL
+        assert [item.key for item in coordinator.data] == ["bg:1", "bg:2"]
+        coordinator.async_set_streaming(False)
+        assert not coordinator.stream_connected
+        assert coordinator.update_interval.total_seconds() < MAX_UPDATE_INTERVAL
+        await coordinator.async_shutdown()
+
+    loop.run_until_complete(scenario())
+
+
+def test_coordinator_keeps_polling_without_stream(loop, hass, session, stub_server) -> None:
+    """A 404 from the stream endpoint leaves the coordinator polling as usual."""
+    stub = StreamStub(404)
+    url = stub_server(stub.app())
+    coordinator = make_coordinator(loop, hass, session, url)
+
+    async def scenario() -> None:
+        coordinator.async_start_stream()
+        await wait_for(lambda: stub.last_event_ids)
+        await asyncio.sleep(0.1)
+        assert not coordinator.stream_connected
+        assert coordinator.update_interval.total_seconds() < MAX_UPDATE_INTERVAL
+        assert [item.key for item in coordinator.data] == ["bg:1", "bg:2"]
+        await coordinator.async_shutdown()
+
+    loop.run_until_complete(scenario())